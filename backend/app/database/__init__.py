@@ -1,3 +1,4 @@
+from sqlalchemy import inspect, text
 from app.database.connection import Base, engine, SessionLocal
 from app.models import Admin, Company, Drive, Question, College, StudentGroup, Student
 import logging
@@ -7,10 +8,54 @@ logger = logging.getLogger(__name__)
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+
+    # create_all never alters existing tables, so add any newer columns and indexes
+    added = sync_schema()
+    if added:
+        logger.info(f"Added missing columns/indexes: {', '.join(added)}")
+
+    # Newly added counter columns start at 0; fill them in from the child tables
+    if any(column in added for column in ("drives.question_count", "drives.student_count", "drives.total_points")):
+        from app.utils.drive_counters import reconcile_drive_counters
+        db = SessionLocal()
+        try:
+            logger.info(f"Initialized counters of {reconcile_drive_counters(db)} drives")
+        finally:
+            db.close()
     
     # Seed initial data after creating tables
     seed_initial_data()
 
+def sync_schema():
+    """Add model columns (nullable or server-defaulted only) and indexes that are missing from existing tables"""
+    inspector = inspect(engine)
+    added_columns = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT '{default}'" if isinstance(default, str) else f" DEFAULT {default.text}"
+                conn.execute(text(ddl))
+                added_columns.append(f"{table.name}.{column.name}")
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=conn)
+                    added_columns.append(f"{table.name}.{index.name}")
+
+    return added_columns
+
 def drop_tables():
     """Drop all database tables"""
     Base.metadata.drop_all(bind=engine)
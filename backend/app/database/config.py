@@ -20,6 +20,56 @@ class Settings(BaseSettings):
     admin_username: str = os.getenv("ADMIN_USERNAME", "admin")
     admin_password: str = os.getenv("ADMIN_PASSWORD", "admin123")
     
+    # Serve the hot student exam endpoints from an async engine/session instead of the thread pool
+    async_student_routes: bool = os.getenv("ASYNC_STUDENT_ROUTES", "false").lower() == "true"
+    async_db_pool_size: int = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+    async_db_max_overflow: int = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20"))
+
+    # Exam
+    # "seed": store a per-student integer seed and derive the question order from it
+    # "list": store the full shuffled list of question ids per student
+    question_order_mode: str = os.getenv("QUESTION_ORDER_MODE", "seed")
+
+    # Admission control for the student exam endpoints (per process); max concurrent 0 disables it.
+    # Keep max concurrent below the database pool size (5 + 10 overflow) so admin/company requests still get connections.
+    exam_admission_max_concurrent: int = int(os.getenv("EXAM_ADMISSION_MAX_CONCURRENT", "10"))
+    # The async student routes (ASYNC_STUDENT_ROUTES) have their own gate over the async pool; by default
+    # it leaves 5 of that pool's connections for the ungated async endpoints (login, violations)
+    exam_admission_async_max_concurrent: int = int(os.getenv(
+        "EXAM_ADMISSION_ASYNC_MAX_CONCURRENT", str(max(async_db_pool_size + async_db_max_overflow - 5, 1))
+    ))
+    exam_admission_max_queue: int = int(os.getenv("EXAM_ADMISSION_MAX_QUEUE", "500"))
+    exam_admission_queue_timeout_seconds: float = float(os.getenv("EXAM_ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+    exam_admission_retry_after_seconds: float = float(os.getenv("EXAM_ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+    # Drive status event streams: how often each worker re-reads a watched drive to pick up
+    # changes made by other workers, and how often an idle stream sends a keep-alive comment
+    drive_events_refresh_seconds: float = float(os.getenv("DRIVE_EVENTS_REFRESH_SECONDS", "15"))
+    drive_events_keepalive_seconds: float = float(os.getenv("DRIVE_EVENTS_KEEPALIVE_SECONDS", "20"))
+
+    # Server-side exam deadlines: expired exams are auto-submitted after this grace period
+    # (so a client submitting right at the deadline still wins), in batches of this size
+    exam_auto_submit_grace_seconds: float = float(os.getenv("EXAM_AUTO_SUBMIT_GRACE_SECONDS", "60"))
+    exam_auto_submit_batch_size: int = int(os.getenv("EXAM_AUTO_SUBMIT_BATCH_SIZE", "500"))
+    exam_deadline_idle_seconds: float = float(os.getenv("EXAM_DEADLINE_IDLE_SECONDS", "60"))
+
+    # How often buffered violation counters are written to the database
+    violation_flush_interval_seconds: float = float(os.getenv("VIOLATION_FLUSH_INTERVAL_SECONDS", "2"))
+
+    # Per-process drive leaderboards are rebuilt from the database this often while a drive
+    # is running, to include submissions handled by other workers
+    leaderboard_refresh_seconds: float = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "30"))
+
+    # Student access token cache (per process); 0 disables it
+    student_auth_cache_size: int = int(os.getenv("STUDENT_AUTH_CACHE_SIZE", "10000"))
+    student_auth_cache_ttl_seconds: float = float(os.getenv("STUDENT_AUTH_CACHE_TTL_SECONDS", "30"))
+
+    # College / student group lists are cached per process; other workers' edits show up within this
+    reference_cache_ttl_seconds: float = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "60"))
+
+    # Browsers may reuse an ended drive's exam-status this long before polling again; 0 disables
+    ended_status_max_age_seconds: int = int(os.getenv("ENDED_STATUS_MAX_AGE_SECONDS", "30"))
+
     # Environment
     environment: str = os.getenv("ENVIRONMENT", "development")
     debug: bool = os.getenv("DEBUG", "true").lower() == "true"
@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -39,6 +40,20 @@ except Exception as e:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the async student router (psycopg 3 serves both sync and async)
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_student_routes:
+    async_engine = create_async_engine(
+        get_database_url(),
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=settings.async_db_pool_size,
+        max_overflow=settings.async_db_max_overflow,
+        echo=False
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False)
+
 def get_db():
     """Database dependency with proper error handling"""
     db = SessionLocal()
@@ -52,3 +67,12 @@ def get_db():
         raise
     finally:
         db.close()
+
+async def get_async_db():
+    """Async database dependency with proper error handling"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -8,7 +9,11 @@ from datetime import datetime
 from app.routes import auth_router, admin_router, company_router
 from app.routes.student import router as student_router
 from app.database import create_tables
+from app.database.connection import async_engine
 from app.database.config import settings
+from app.utils.drive_lifecycle import run_drive_lifecycle
+from app.utils.exam_deadlines import run_deadline_scheduler
+from app.utils.violation_buffer import run_violation_flusher
 
 # Configure logging
 logging.basicConfig(
@@ -34,10 +39,25 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database initialization failed: {str(e)}")
         raise
     
+    # Background writer for buffered violation counters
+    violation_flusher = asyncio.create_task(run_violation_flusher(settings.violation_flush_interval_seconds))
+    
+    # Auto-submits exams whose deadline or drive window has passed
+    deadline_scheduler = asyncio.create_task(run_deadline_scheduler())
+    
+    # Persists drive status transitions (upcoming -> live -> completed) at their boundary times
+    drive_lifecycle = asyncio.create_task(run_drive_lifecycle())
+    
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Company Exam Portal API...")
+    background_tasks = [drive_lifecycle, deadline_scheduler, violation_flusher]
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -80,13 +100,18 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
     )
 
 # Include API routes
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
 app.include_router(company_router, prefix="/api/company", tags=["Company"])
+if settings.async_student_routes:
+    from app.routes.student_async import router as student_async_router
+    # Registered before the sync router so its async endpoints win on the shared paths
+    app.include_router(student_async_router, prefix="/api/student", tags=["Student"])
 app.include_router(student_router, prefix="/api/student", tags=["Student"])
 
 @app.get("/")
@@ -0,0 +1,93 @@
+"""
+Maintenance commands.
+
+Usage (from the backend directory):
+    python -m app.manage backfill-question-seeds
+    python -m app.manage regrade-drive DRIVE_ID
+    python -m app.manage prepare-exam-state DRIVE_ID
+    python -m app.manage reconcile-drive-counters [--drive-id DRIVE_ID]
+"""
+import argparse
+from app.database import create_tables
+from app.database.connection import SessionLocal
+from app.models import Question
+from app.utils.drive_counters import reconcile_drive_counters
+from app.utils.exam_state import materialize_exam_state
+from app.utils.question_order import backfill_question_seeds
+from app.utils.regrade import regrade_drive
+
+
+def backfill_question_seeds_command(args):
+    """Assign question order seeds to students that have not started their exam"""
+    db = SessionLocal()
+    try:
+        count = backfill_question_seeds(db)
+        print(f"Assigned question order seeds to {count} students")
+    finally:
+        db.close()
+
+
+def regrade_drive_command(args):
+    """Regrade a drive's submitted responses against its current answer key"""
+    db = SessionLocal()
+    try:
+        summary = regrade_drive(db, args.drive_id)
+        print(
+            f"Drive {args.drive_id}: {summary['responses_changed']} of {summary['responses_checked']} responses changed, "
+            f"{summary['students_rescored']} of {summary['students_checked']} student scores updated"
+        )
+    finally:
+        db.close()
+
+
+def prepare_exam_state_command(args):
+    """Pre-generate question orders and violation counters for a drive's students ahead of the start"""
+    db = SessionLocal()
+    try:
+        question_ids = [row.id for row in db.query(Question.id).filter(Question.drive_id == args.drive_id)]
+        count = materialize_exam_state(db, args.drive_id, question_ids)
+        db.commit()
+        print(f"Drive {args.drive_id}: prepared exam state for {count} students")
+    finally:
+        db.close()
+
+
+def reconcile_drive_counters_command(args):
+    """Recompute the drives' question/student counters and total points from the child tables"""
+    db = SessionLocal()
+    try:
+        count = reconcile_drive_counters(db, args.drive_id)
+        print(f"Corrected counters of {count} drives")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "backfill-question-seeds": backfill_question_seeds_command,
+    "regrade-drive": regrade_drive_command,
+    "prepare-exam-state": prepare_exam_state_command,
+    "reconcile-drive-counters": reconcile_drive_counters_command,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="Company Exam Portal maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("backfill-question-seeds", help=backfill_question_seeds_command.__doc__)
+    regrade_parser = subparsers.add_parser("regrade-drive", help=regrade_drive_command.__doc__)
+    regrade_parser.add_argument("drive_id", type=int)
+    prepare_parser = subparsers.add_parser("prepare-exam-state", help=prepare_exam_state_command.__doc__)
+    prepare_parser.add_argument("drive_id", type=int)
+    reconcile_parser = subparsers.add_parser("reconcile-drive-counters", help=reconcile_drive_counters_command.__doc__)
+    reconcile_parser.add_argument("--drive-id", type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    # Make sure newer columns exist before touching them
+    create_tables()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
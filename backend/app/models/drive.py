@@ -26,7 +26,12 @@ class Drive(Base):
     exam_duration_minutes = Column(Integer, nullable=False)  # How long each student gets
     duration_minutes = Column(Integer, nullable=True)
 
-    status = Column(String, default="draft")  # draft, submitted, approved, rejected, upcoming, live, completed, suspended
+    # Denormalized counters, maintained by the upload/duplicate paths (see app.utils.drive_counters)
+    question_count = Column(Integer, nullable=False, default=0, server_default="0")
+    student_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_points = Column(Integer, nullable=False, default=0, server_default="0")
+
+    status = Column(String, default="draft", index=True)  # draft, submitted, approved, rejected, upcoming, live, completed, suspended (time-based ones kept current by the drive lifecycle timers)
     is_approved = Column(Boolean, default=False)
     admin_notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -8,6 +8,10 @@ from app.database.connection import Base
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        # Roster dedupe on upload and per-drive lookups
+        Index("ix_students_drive_id_email", "drive_id", "email"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     drive_id = Column(Integer, ForeignKey("drives.id", ondelete="CASCADE"), nullable=False)
@@ -25,7 +29,8 @@ class Student(Base):
     access_token = Column(String(36), unique=True, nullable=False, index=True, default=lambda: str(uuid.uuid4()))
 
     # Exam progress fields
-    question_order = Column(JSON, nullable=True)  # Array of question IDs in randomized order
+    question_order = Column(JSON, nullable=True)  # Array of question IDs in randomized order (legacy / list mode)
+    question_seed = Column(Integer, nullable=True)  # Seed the randomized order is derived from (seed mode)
     exam_started_at = Column(DateTime, nullable=True)
     exam_submitted_at = Column(DateTime, nullable=True)
 
@@ -1,69 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 from app.database.connection import get_db
+from app.database.config import settings
 from app.models import Company, Drive, College, StudentGroup
 from app.schemas.company import CompanyResponse, CompanyApprovalUpdate, CollegeResponse, StudentGroupResponse
 from app.schemas.drive import DriveResponse, AdminDriveApprovalUpdate
 from app.auth import get_admin_user
-
-def format_drive_response(drive, db):
-    """Format drive response with resolved target names and company info"""
-    targets = []
-    for target in drive.targets:
-        college_name = target.custom_college_name
-        if not college_name and target.college_id:
-            college = db.query(College).filter(College.id == target.college_id).first()
-            college_name = college.name if college else "Unknown College"
-        
-        group_name = target.custom_student_group_name
-        if not group_name and target.student_group_id:
-            group = db.query(StudentGroup).filter(StudentGroup.id == target.student_group_id).first()
-            group_name = group.name if group else "Unknown Group"
-        
-        targets.append({
-            "id": target.id,
-            "college_id": target.college_id,
-            "custom_college_name": target.custom_college_name,
-            "college_name": college_name,
-            "student_group_id": target.student_group_id,
-            "custom_student_group_name": target.custom_student_group_name,
-            "student_group_name": group_name,
-            "batch_year": target.batch_year
-        })
-    
-    # Get company information
-    company_name = "Unknown Company"
-    if drive.company_id:
-        company = db.query(Company).filter(Company.id == drive.company_id).first()
-        company_name = company.company_name if company else "Unknown Company"
-    
-    return {
-        "id": drive.id,
-        "company_id": drive.company_id,
-        "company_name": company_name,
-        "title": drive.title,
-        "description": drive.description,
-        "category": drive.category,
-        "targets": targets,
-        "window_start": drive.window_start,
-        "window_end": drive.window_end,
-        "actual_window_start": drive.actual_window_start,
-        "actual_window_end": drive.actual_window_end,
-        "exam_duration_minutes": drive.exam_duration_minutes,
-        # Legacy fields (kept in DB but not used)
-        "question_type": None,
-        "duration_minutes": None,
-        "scheduled_start": None,
-        "actual_start": None,
-        "actual_end": None,
-        "status": drive.status,
-        "is_approved": drive.is_approved,
-        "admin_notes": drive.admin_notes,
-        "created_at": drive.created_at,
-        "updated_at": drive.updated_at
-    }
+from app.utils.admission import async_exam_admission, exam_admission
+from app.utils.drive_events import drive_events, stream_drive_events, SSE_HEADERS
+from app.utils.drive_lifecycle import get_drive_status, apply_drive_status, TIME_BASED_STATUSES
+from app.utils.drive_serializer import serialize_drive, serialize_drives
+from app.utils.etag import json_response, not_modified, set_validators
+from app.utils.exam_cache import exam_cache
+from app.utils.exam_deadlines import cancel_drive_window_end
+from app.utils.leaderboard import leaderboards
+from app.utils.reference_cache import reference_cache
+from app.utils.response_versions import drive_etag, exam_status_cache_control
+from app.utils.regrade import regrade_drive
+from app.utils.student_auth_cache import student_auth_cache
+from app.utils.violation_buffer import violation_buffer
 
 router = APIRouter()
 
@@ -175,7 +133,7 @@ def delete_company(
 def get_all_drives(
     skip: int = 0,
     limit: int = 100,
-    status_filter: str = "pending",  # pending, all, approved, rejected, suspended
+    status_filter: str = "pending",  # pending, all, approved, rejected, suspended, upcoming, live, completed
     db: Session = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
@@ -191,19 +149,19 @@ def get_all_drives(
         query = query.filter(Drive.status == "rejected")
     elif status_filter == "suspended":
         query = query.filter(Drive.status == "suspended")
+    elif status_filter in TIME_BASED_STATUSES:
+        # Persisted by the drive lifecycle timers, so this filters in SQL
+        query = query.filter(Drive.is_approved == True, Drive.status == status_filter)
     # "all" shows everything
     
     drives = query.offset(skip).limit(limit).all()
     
     # Format drives and override status with calculated status if approved
-    result = []
-    for drive in drives:
-        drive_dict = format_drive_response(drive, db)
+    result = serialize_drives(db, drives, with_counts=True, admin=True)
+    for drive, drive_dict in zip(drives, result):
         # Override status with calculated status if approved
         if drive.is_approved:
-            from app.routes.company import get_drive_status
             drive_dict["status"] = get_drive_status(drive)
-        result.append(drive_dict)
     
     return result
 
@@ -226,11 +184,17 @@ def approve_drive(
         drive.status = "approved"
     else:
         drive.status = "rejected"
+    apply_drive_status(drive)
     
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive_id)
+    drive_events.notify(drive_id)
+    if drive.is_approved:
+        # Compile the answer key once now instead of on the first submission
+        exam_cache.warm(db, drive_id)
     
-    return format_drive_response(drive, db)
+    return serialize_drive(db, drive, admin=True)
 
 @router.put("/drives/{drive_id}/suspend")
 def suspend_drive(
@@ -269,10 +233,12 @@ def suspend_drive(
         ).delete(synchronize_session=False)
     
     # Reset student exam state (keep uploaded student data but clear exam progress)
+    violation_buffer.discard(student_ids)
     for student in students:
         student.exam_started_at = None
         student.exam_submitted_at = None
         student.question_order = None
+        student.question_seed = None
         student.violation_details = None
         student.score = None
         student.total_marks = None
@@ -281,9 +247,15 @@ def suspend_drive(
     drive.status = "suspended"
     drive.actual_window_start = None
     drive.actual_window_end = None
+    apply_drive_status(drive)
     
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive_id)
+    drive_events.notify(drive_id)
+    student_auth_cache.invalidate_drive(drive_id)
+    cancel_drive_window_end(drive_id)
+    leaderboards.invalidate(drive_id)
     
     message = f"Drive suspended successfully. {deleted_responses} student responses deleted."
     if was_ongoing:
@@ -313,9 +285,12 @@ def reactivate_drive(
         raise HTTPException(status_code=400, detail="Only suspended drives can be reactivated")
     
     drive.status = "approved"
+    apply_drive_status(drive)
     
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive_id)
+    drive_events.notify(drive_id)
     
     return {
         "message": "Drive reactivated successfully",
@@ -337,7 +312,7 @@ def get_drive_detail(
         raise HTTPException(status_code=404, detail="Drive not found")
     
     # Get basic drive info
-    drive_info = format_drive_response(drive, db)
+    drive_info = serialize_drive(db, drive, with_counts=True, admin=True)
     
     # Get questions
     questions = db.query(Question).filter(Question.drive_id == drive_id).all()
@@ -396,12 +371,13 @@ def get_drive_detail(
 
 @router.get("/colleges", response_model=List[CollegeResponse])
 def get_all_colleges(
+    request: Request,
     db: Session = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
-    """Get all colleges"""
-    colleges = db.query(College).all()
-    return colleges
+    """Get all colleges (cached; supports If-None-Match)"""
+    body, etag = reference_cache.get(db, "colleges", approved_only=False)
+    return not_modified(request, etag) or json_response(body, etag)
 
 @router.get("/colleges/pending")
 def get_pending_custom_colleges(
@@ -474,6 +450,7 @@ def approve_custom_college(
         target.custom_college_name = None  # Clear custom name
     
     db.commit()
+    reference_cache.invalidate()
     
     return {
         "message": "College approved successfully", 
@@ -494,17 +471,19 @@ def approve_college(
     
     college.is_approved = True
     db.commit()
+    reference_cache.invalidate()
     
     return {"message": "College approved successfully"}
 
 @router.get("/student-groups", response_model=List[StudentGroupResponse])
 def get_all_student_groups(
+    request: Request,
     db: Session = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
-    """Get all student groups"""
-    groups = db.query(StudentGroup).all()
-    return groups
+    """Get all student groups (cached; supports If-None-Match)"""
+    body, etag = reference_cache.get(db, "student_groups", approved_only=False)
+    return not_modified(request, etag) or json_response(body, etag)
 
 @router.get("/student-groups/pending")
 def get_pending_custom_student_groups(
@@ -577,6 +556,7 @@ def approve_custom_student_group(
         target.custom_student_group_name = None  # Clear custom name
     
     db.commit()
+    reference_cache.invalidate()
     
     return {
         "message": "Student group approved successfully", 
@@ -597,6 +577,7 @@ def approve_student_group(
     
     group.is_approved = True
     db.commit()
+    reference_cache.invalidate()
     
     return {"message": "Student group approved successfully"}
 
@@ -616,6 +597,7 @@ def create_college(
     college = College(name=college_data["name"], is_approved=True)
     db.add(college)
     db.commit()
+    reference_cache.invalidate()
     db.refresh(college)
     
     return {"message": "College created successfully", "college": college}
@@ -643,6 +625,7 @@ def update_college(
         college.is_approved = college_data["is_approved"]
     
     db.commit()
+    reference_cache.invalidate()
     db.refresh(college)
     
     return {"message": "College updated successfully", "college": college}
@@ -660,6 +643,7 @@ def delete_college(
     
     db.delete(college)
     db.commit()
+    reference_cache.invalidate()
     
     return {"message": "College deleted successfully"}
 
@@ -678,6 +662,7 @@ def create_student_group(
     group = StudentGroup(name=group_data["name"], is_approved=True)
     db.add(group)
     db.commit()
+    reference_cache.invalidate()
     db.refresh(group)
     
     return {"message": "Student group created successfully", "group": group}
@@ -705,6 +690,7 @@ def update_student_group(
         group.is_approved = group_data["is_approved"]
     
     db.commit()
+    reference_cache.invalidate()
     db.refresh(group)
     
     return {"message": "Student group updated successfully", "group": group}
@@ -722,16 +708,66 @@ def delete_student_group(
     
     db.delete(group)
     db.commit()
+    reference_cache.invalidate()
     
     return {"message": "Student group deleted successfully"}
 
+@router.get("/drives/{drive_id}/events")
+def stream_drive_status_events_admin(
+    drive_id: int,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Server-Sent Events stream of the drive's status and window changes"""
+    if not db.query(Drive.id).filter(Drive.id == drive_id).first():
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    # get_db's cleanup only runs once the stream ends; give the connection back now
+    db.close()
+    return StreamingResponse(
+        stream_drive_events(drive_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@router.get("/admission-metrics")
+def get_admission_metrics(
+    admin: dict = Depends(get_admin_user)
+):
+    """Queue depth and counters of the student exam admission controllers (this worker only)"""
+    metrics = exam_admission.metrics()
+    if settings.async_student_routes:
+        metrics["async_routes"] = async_exam_admission.metrics()
+    return metrics
+
+@router.post("/drives/{drive_id}/regrade")
+def regrade_drive_admin(
+    drive_id: int,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Recompute response correctness and scores of a drive against its current answer key"""
+    drive = db.query(Drive).filter(Drive.id == drive_id).first()
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+    
+    summary = regrade_drive(db, drive_id)
+    
+    return {
+        "success": True,
+        "message": f"Regraded {summary['responses_checked']} responses; {summary['students_rescored']} student scores changed",
+        **summary
+    }
+
 @router.get("/drives/{drive_id}/exam-status")
 def get_exam_status_admin(
     drive_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
-    """Get exam status for a drive (Admin view) - using new window fields"""
+    """Get exam status for a drive (Admin view) - using new window fields (supports If-None-Match)"""
     drive = db.query(Drive).filter(Drive.id == drive_id).first()
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
@@ -739,7 +775,7 @@ def get_exam_status_admin(
     now = datetime.utcnow()
     
     # Count students
-    student_count = len(drive.students)
+    student_count = drive.student_count
     has_students = student_count > 0
     
     # Calculate time remaining until window closes
@@ -773,6 +809,14 @@ def get_exam_status_admin(
         exam_state = "ongoing"
     else:
         exam_state = "not_started"
+
+    # Tagged by the absolute end, not the countdown, so polls during the window can be 304s
+    etag = drive_etag(drive, exam_state, window_end, time_remaining_seconds == 0)
+    cache_control = exam_status_cache_control(exam_state)
+    unchanged = not_modified(request, etag, cache_control)
+    if unchanged:
+        return unchanged
+    set_validators(response, etag, cache_control)
     
     return {
         "drive_id": drive.id,
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Header
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import csv
 import io
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -20,44 +22,30 @@ from app.schemas.email import (
 from app.schemas.company import CollegeResponse, StudentGroupResponse
 from app.auth import get_company_user, get_company_or_admin_user
 from app.utils.email_processor import EmailTemplateProcessor, TEMPLATE_VARIABLES
+from app.utils.drive_events import drive_events, stream_drive_events, SSE_HEADERS
+from app.utils.drive_counters import adjust_drive_counters
+from app.utils.drive_lifecycle import get_drive_status, apply_drive_status
+from app.utils.drive_serializer import serialize_drive, serialize_drives
+from app.utils.etag import json_response, not_modified, set_validators
+from app.utils.exam_cache import exam_cache
+from app.utils.exam_deadlines import schedule_drive_window_end, cancel_drive_window_end
+from app.utils.exam_state import materialize_exam_state
+from app.utils.item_analysis import analyze_questions, item_analysis_cache
+from app.utils.leaderboard import leaderboards
+from app.utils.question_order import resolve_question_order
+from app.utils.reference_cache import reference_cache
+from app.utils.response_versions import drive_etag, exam_status_cache_control, results_etag, results_fingerprint
+from app.utils.regrade import regrade_drive
+from app.utils.results_columnar import COLUMNAR_FORMATS, stream_columnar
+from app.utils.results_export import SUMMARY_HEADER, iter_summary_rows, iter_detailed_rows, stream_csv
+from app.utils.results_query import (
+    RESULT_STATUSES, SORT_KEYS, MAX_RESULTS_PAGE_SIZE, filter_results, page_results
+)
+from app.utils.student_auth_cache import student_auth_cache
+from app.utils.student_import import import_students_csv, lock_drive_roster
 
 router = APIRouter()
-
-def get_drive_status(drive: Drive) -> str:
-    """Calculate drive status on-the-fly based on current time and window times"""
-    if drive.status == "suspended":
-        return "suspended"
-    if drive.status in ["draft", "submitted", "rejected"]:
-        return drive.status
-    if not drive.is_approved:
-        return drive.status
-
-    now = datetime.utcnow()
-
-    # Check if drive has been manually ended
-    if drive.actual_window_end and now >= drive.actual_window_end:
-        return "completed"
-
-    # Check if drive is manually started and still active
-    if drive.actual_window_start:
-        # Calculate when window should end based on actual start
-        if drive.window_start and drive.window_end:
-            window_duration = drive.window_end - drive.window_start
-            expected_end = drive.actual_window_start + window_duration
-            if now >= expected_end:
-                return "completed"
-            return "live"
-
-    # Check scheduled window times
-    if drive.window_start and drive.window_end:
-        if now >= drive.window_end:
-            return "completed"
-        if now >= drive.window_start:
-            return "live"
-        if now < drive.window_start:
-            return "upcoming"
-
-    return drive.status
+logger = logging.getLogger(__name__)
 
 def get_effective_company_id(
     current_user: dict = Depends(get_company_or_admin_user),
@@ -86,83 +74,31 @@ def get_effective_company_id(
             detail="Access denied"
         )
 
-def format_drive_response(drive: Drive, db: Session):
-    """Format drive response with resolved target information"""
-    targets = []
-    for target in drive.targets:
-        college_name = None
-        student_group_name = None
-
-        if target.college_id:
-            college = db.query(College).filter(College.id == target.college_id).first()
-            college_name = college.name if college else None
-        elif target.custom_college_name:
-            college_name = target.custom_college_name
-
-        if target.student_group_id:
-            group = db.query(StudentGroup).filter(StudentGroup.id == target.student_group_id).first()
-            student_group_name = group.name if group else None
-        elif target.custom_student_group_name:
-            student_group_name = target.custom_student_group_name
-
-        targets.append({
-            "id": target.id,
-            "college_id": target.college_id,
-            "custom_college_name": target.custom_college_name,
-            "student_group_id": target.student_group_id,
-            "custom_student_group_name": target.custom_student_group_name,
-            "batch_year": target.batch_year,
-            "college_name": college_name,
-            "student_group_name": student_group_name
-        })
-
-    # Get company name
-    company = db.query(Company).filter(Company.id == drive.company_id).first()
-    company_name = company.company_name if company else None
-
-    return {
-        "id": drive.id,
-        "company_id": drive.company_id,
-        "company_name": company_name,
-        "title": drive.title,
-        "description": drive.description,
-        "category": drive.category or "Technical MCQ",  # Default if null
-        "targets": targets,
-        "window_start": drive.window_start,  # May be null, but schema allows it
-        "window_end": drive.window_end,      # May be null, but schema allows it
-        "actual_window_start": drive.actual_window_start,
-        "actual_window_end": drive.actual_window_end,
-        "exam_duration_minutes": drive.exam_duration_minutes or 60,  # Default if null
-        "duration_minutes": drive.duration_minutes,  # Window duration in minutes
-        "status": drive.status,
-        "is_approved": drive.is_approved,
-        "admin_notes": drive.admin_notes,
-        "created_at": drive.created_at,
-        "updated_at": drive.updated_at
-    }
-
 @router.get("/drives", response_model=List[DriveResponse])
 def get_company_drives(
     skip: int = 0,
     limit: int = 100,
+    status_filter: Optional[str] = None,  # Optional stored status, e.g. upcoming, live, completed, or approved
     db: Session = Depends(get_db),
     company_id: int = Depends(get_effective_company_id)
 ):
     """Get all drives for the authenticated company or admin viewing a specific company"""
-    drives = db.query(Drive).filter(
+    query = db.query(Drive).filter(
         Drive.company_id == company_id  # Show all drives so company can see status
-    ).offset(skip).limit(limit).all()
+    )
+    if status_filter == "approved":
+        # An approved drive's stored status is its time-based status (upcoming, live, completed)
+        query = query.filter(Drive.is_approved == True)
+    elif status_filter:
+        query = query.filter(Drive.status == status_filter)
+    drives = query.offset(skip).limit(limit).all()
 
     # Add counts for each drive and calculate dynamic status
-    result = []
-    for drive in drives:
-        drive_dict = format_drive_response(drive, db)
-        drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-        drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    result = serialize_drives(db, drives, with_counts=True)
+    for drive, drive_dict in zip(drives, result):
         # Override status with calculated status if approved
         if drive.is_approved:
             drive_dict["status"] = get_drive_status(drive)
-        result.append(drive_dict)
 
     return result
 
@@ -205,6 +141,7 @@ def create_drive(
     db.flush()  # Get the drive ID without committing
 
     # Create drive targets
+    created_reference = False
     for target_data in drive_data.targets:
         # Create custom colleges and student groups if provided
         if target_data.custom_college_name:
@@ -213,6 +150,7 @@ def create_drive(
                 new_college = College(name=target_data.custom_college_name, is_approved=False)
                 db.add(new_college)
                 db.flush()
+                created_reference = True
 
         if target_data.custom_student_group_name:
             existing_group = db.query(StudentGroup).filter(StudentGroup.name == target_data.custom_student_group_name).first()
@@ -220,6 +158,7 @@ def create_drive(
                 new_group = StudentGroup(name=target_data.custom_student_group_name, is_approved=False)
                 db.add(new_group)
                 db.flush()
+                created_reference = True
 
         # Create drive target
         drive_target = DriveTarget(
@@ -234,12 +173,10 @@ def create_drive(
 
     db.commit()
     db.refresh(drive)
+    if created_reference:
+        reference_cache.invalidate()
 
-    # Load the drive with targets for response
-    drive_with_targets = db.query(Drive).filter(Drive.id == drive.id).first()
-    drive_dict = format_drive_response(drive_with_targets, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
     return drive_dict
 
 @router.get("/drives/{drive_id}", response_model=DriveResponse)
@@ -257,9 +194,7 @@ def get_drive(
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
     return drive_dict
 
 @router.put("/drives/{drive_id}", response_model=DriveResponse)
@@ -313,6 +248,7 @@ def update_drive(
         db.query(DriveTarget).filter(DriveTarget.drive_id == drive_id).delete()
 
         # Add new targets
+        created_reference = False
         for target_data in drive_data.targets:
             # Create custom colleges and student groups if provided
             if target_data.custom_college_name:
@@ -321,6 +257,7 @@ def update_drive(
                     new_college = College(name=target_data.custom_college_name, is_approved=False)
                     db.add(new_college)
                     db.flush()
+                    created_reference = True
 
             if target_data.custom_student_group_name:
                 existing_group = db.query(StudentGroup).filter(StudentGroup.name == target_data.custom_student_group_name).first()
@@ -328,6 +265,7 @@ def update_drive(
                     new_group = StudentGroup(name=target_data.custom_student_group_name, is_approved=False)
                     db.add(new_group)
                     db.flush()
+                    created_reference = True
 
             # Create drive target
             drive_target = DriveTarget(
@@ -342,10 +280,12 @@ def update_drive(
 
     db.commit()
     db.refresh(drive)
+    if drive_data.targets is not None and created_reference:
+        reference_cache.invalidate()
+    exam_cache.invalidate(drive.id)
+    drive_events.notify(drive.id)
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
     return drive_dict
 
 @router.delete("/drives/{drive_id}")
@@ -369,6 +309,7 @@ def delete_drive(
 
     db.delete(drive)
     db.commit()
+    drive_events.notify(drive_id)
 
     return {"message": "Drive deleted successfully"}
 
@@ -391,21 +332,18 @@ def submit_drive_for_approval(
         raise HTTPException(status_code=400, detail="Only draft drives can be submitted")
 
     # Check if drive has questions and students
-    question_count = db.query(Question).filter(Question.drive_id == drive_id).count()
-    if question_count == 0:
+    if drive.question_count == 0:
         raise HTTPException(status_code=400, detail="Drive must have at least one question to submit")
 
-    student_count = db.query(Student).filter(Student.drive_id == drive_id).count()
-    if student_count == 0:
+    if drive.student_count == 0:
         raise HTTPException(status_code=400, detail="Drive must have at least one student to submit")
 
     drive.status = "submitted"
     db.commit()
     db.refresh(drive)
+    drive_events.notify(drive.id)
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
     return drive_dict
 
 @router.put("/drives/{drive_id}/status", response_model=DriveResponse)
@@ -428,12 +366,13 @@ def update_drive_status(
         raise HTTPException(status_code=400, detail="Drive not approved by admin")
 
     drive.status = status_data.status
+    apply_drive_status(drive)
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive.id)
+    drive_events.notify(drive.id)
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
     return drive_dict
 
 @router.post("/drives/{drive_id}/duplicate", response_model=DriveResponse)
@@ -481,6 +420,8 @@ def duplicate_drive(
 
     # Copy all questions
     original_questions = db.query(Question).filter(Question.drive_id == drive_id).all()
+    new_drive.question_count = len(original_questions)
+    new_drive.total_points = sum(question.points for question in original_questions)
     for question in original_questions:
         new_question = Question(
             drive_id=new_drive.id,
@@ -496,10 +437,9 @@ def duplicate_drive(
 
     db.commit()
     db.refresh(new_drive)
+    exam_cache.invalidate(new_drive.id)
 
-    drive_dict = format_drive_response(new_drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == new_drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == new_drive.id).count()
+    drive_dict = serialize_drive(db, new_drive, with_counts=True)
     return drive_dict
 
 # Question management routes
@@ -580,6 +520,7 @@ def upload_questions_csv(
             raise HTTPException(status_code=400, detail="No valid questions found in CSV")
 
         db.add_all(questions)
+        adjust_drive_counters(db, drive_id, questions=len(questions), points=sum(q.points for q in questions))
         db.commit()
 
         return {"message": f"Successfully uploaded {len(questions)} questions from CSV"}
@@ -596,9 +537,13 @@ def upload_students_csv(
     db: Session = Depends(get_db),
     company: dict = Depends(get_company_user)
 ):
-    """Upload students from CSV file. Expected columns: name, email, roll_number, phone, college, student_group"""
-    import uuid
+    """
+    Upload students from CSV file. Expected columns: name, email, roll_number, phone, college, student_group
 
+    The file is parsed as it is read and inserted in chunks. Students whose email
+    is already in the drive (or earlier in the file) are skipped; invalid rows
+    are skipped and listed in errors by row number.
+    """
     drive = db.query(Drive).filter(
         Drive.id == drive_id,
         Drive.company_id == company.id
@@ -614,63 +559,37 @@ def upload_students_csv(
         raise HTTPException(status_code=400, detail="File must be CSV format")
 
     try:
-        content = file.file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(content))
-
-        required_columns = ['name', 'email', 'roll_number']
-        if not all(col in csv_reader.fieldnames for col in required_columns):
-            raise HTTPException(
-                status_code=400,
-                detail=f"CSV must contain columns: {', '.join(required_columns)}. Optional: phone, college, student_group"
-            )
-
-        students = []
-        for row_num, row in enumerate(csv_reader, start=2):  # Start from 2 because of header
-            try:
-                # Check if student already exists in this drive (by email)
-                existing_student = db.query(Student).filter(
-                    Student.drive_id == drive_id,
-                    Student.email == row['email'].strip().lower()
-                ).first()
-
-                if existing_student:
-                    continue  # Skip duplicate students
-
-                # Generate unique access token
-                access_token = str(uuid.uuid4())
-
-                student = Student(
-                    drive_id=drive_id,
-                    company_id=company.id,
-                    name=row['name'].strip(),
-                    email=row['email'].strip().lower(),
-                    roll_number=row['roll_number'].strip(),
-                    phone=row.get('phone', '').strip() if row.get('phone', '').strip() else None,
-                    college_name=row.get('college', '').strip() if row.get('college', '').strip() else None,
-                    student_group_name=row.get('student_group', '').strip() if row.get('student_group', '').strip() else None,
-                    access_token=access_token
-                )
-                students.append(student)
-
-            except (ValueError, KeyError) as e:
-                raise HTTPException(status_code=400, detail=f"Error in row {row_num}: {str(e)}")
-
-        if not students:
-            raise HTTPException(status_code=400, detail="No new students found in CSV (duplicates skipped)")
-
-        db.add_all(students)
-        db.commit()
-
-        return {
-            "message": f"Successfully uploaded {len(students)} new students from CSV",
-            "count": len(students)
-        }
-
+        report = import_students_csv(db, drive_id, company.id, file.file)
     except UnicodeDecodeError:
+        db.rollback()
         raise HTTPException(status_code=400, detail="File encoding not supported. Please use UTF-8")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=400, detail=f"Error processing CSV: {str(e)}")
 
+    added = report["added"]
+    if not added:
+        db.rollback()
+        detail = "No new students found in CSV (duplicates skipped)"
+        if report["errors"]:
+            first = report["errors"][0]
+            detail += f"; {report['error_count']} invalid rows (row {first['row']}: {first['error']})"
+        raise HTTPException(status_code=400, detail=detail)
+
+    db.commit()
+
+    return {
+        "message": f"Successfully uploaded {added} new students from CSV",
+        "count": added,
+        "duplicates_in_file": report["duplicates_in_file"],
+        "duplicates_in_drive": report["duplicates_in_drive"],
+        "error_count": report["error_count"],
+        "errors": report["errors"]
+    }
+
 @router.get("/drives/{drive_id}/students", response_model=List[StudentResponse])
 def get_drive_students(
     drive_id: int,
@@ -692,21 +611,23 @@ def get_drive_students(
 # Reference data endpoints for targeting
 @router.get("/colleges", response_model=List[CollegeResponse])
 def get_approved_colleges(
+    request: Request,
     db: Session = Depends(get_db),
     company: dict = Depends(get_company_user)
 ):
-    """Get all approved colleges for targeting"""
-    colleges = db.query(College).filter(College.is_approved == True).all()
-    return colleges
+    """Get all approved colleges for targeting (cached; supports If-None-Match)"""
+    body, etag = reference_cache.get(db, "colleges", approved_only=True)
+    return not_modified(request, etag) or json_response(body, etag)
 
 @router.get("/student-groups", response_model=List[StudentGroupResponse])
 def get_approved_student_groups(
+    request: Request,
     db: Session = Depends(get_db),
     company: dict = Depends(get_company_user)
 ):
-    """Get all approved student groups for targeting"""
-    groups = db.query(StudentGroup).filter(StudentGroup.is_approved == True).all()
-    return groups
+    """Get all approved student groups for targeting (cached; supports If-None-Match)"""
+    body, etag = reference_cache.get(db, "student_groups", approved_only=True)
+    return not_modified(request, etag) or json_response(body, etag)
 
 # Email Template Management
 @router.get("/email-template", response_model=EmailTemplateResponse)
@@ -923,7 +844,7 @@ def get_email_status(
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
 
-    student_count = db.query(Student).filter(Student.drive_id == drive_id).count()
+    student_count = drive.student_count
     company_obj = db.query(Company).filter(Company.id == company.id).first()
 
     # Check email configuration
@@ -1002,6 +923,7 @@ async def upload_questions_csv(
         csv_reader = csv.DictReader(io.StringIO(csv_data))
 
         added_count = 0
+        added_points = 0
         error_count = 0
         errors = []
 
@@ -1038,11 +960,13 @@ async def upload_questions_csv(
 
                 db.add(question)
                 added_count += 1
+                added_points += question.points
 
             except Exception as e:
                 errors.append(f"Row {row_num}: {str(e)}")
                 error_count += 1
 
+        adjust_drive_counters(db, drive_id, questions=added_count, points=added_points)
         db.commit()
 
         return {
@@ -1086,6 +1010,10 @@ async def upload_students_csv(
         added_count = 0
         error_count = 0
         errors = []
+        created_reference = False
+
+        # Held until the commit, so a concurrent upload cannot add the same emails
+        lock_drive_roster(db, drive_id)
 
         for row_num, row in enumerate(csv_reader, start=2):  # Start from row 2 (after header)
             try:
@@ -1119,6 +1047,7 @@ async def upload_students_csv(
                         college = College(name=college_name, is_approved=False)
                         db.add(college)
                         db.flush()  # To get the college ID
+                        created_reference = True
 
                 # Get or create student group
                 group_name = row.get('student_group', '').strip()
@@ -1130,6 +1059,7 @@ async def upload_students_csv(
                         student_group = StudentGroup(name=group_name, is_approved=False)
                         db.add(student_group)
                         db.flush()  # To get the group ID
+                        created_reference = True
 
                 # Create student
                 student = Student(
@@ -1148,7 +1078,10 @@ async def upload_students_csv(
                 errors.append(f"Row {row_num}: {str(e)}")
                 error_count += 1
 
+        adjust_drive_counters(db, drive_id, students=added_count)
         db.commit()
+        if created_reference:
+            reference_cache.invalidate()
 
         return {
             "success": True,
@@ -1214,17 +1147,26 @@ def start_exam(
 
     # Set the actual window end time
     drive.actual_window_end = now + timedelta(minutes=window_duration_minutes)
+    apply_drive_status(drive, now)
 
     print(f"DEBUG: actual_window_start: {drive.actual_window_start}")
     print(f"DEBUG: actual_window_end: {drive.actual_window_end}")
     print(f"DEBUG: total window duration: {window_duration_minutes} minutes")
 
+    # Prepare every student's question order and violation counters in bulk,
+    # so each student's own start is just a timestamp update
+    question_ids = [row.id for row in db.query(Question.id).filter(Question.drive_id == drive.id)]
+    prepared_students = materialize_exam_state(db, drive.id, question_ids)
+    logger.info(f"Prepared exam state for {prepared_students} students of drive {drive.id}")
+
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive.id)
+    drive_events.notify(drive.id)
+    student_auth_cache.invalidate_drive(drive.id)
+    schedule_drive_window_end(drive.id, drive.actual_window_end)
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
 
     return {
         "success": True,
@@ -1259,6 +1201,7 @@ def end_exam(
     now = datetime.utcnow()
     drive.actual_window_end = now
     drive.status = "completed"
+    apply_drive_status(drive, now)
 
     # Auto-submit all students who are currently taking the exam
     students_in_progress = db.query(Student).filter(
@@ -1274,10 +1217,12 @@ def end_exam(
 
     db.commit()
     db.refresh(drive)
+    exam_cache.invalidate(drive.id)
+    drive_events.notify(drive.id)
+    student_auth_cache.invalidate_drive(drive.id)
+    cancel_drive_window_end(drive.id)
 
-    drive_dict = format_drive_response(drive, db)
-    drive_dict["question_count"] = db.query(Question).filter(Question.drive_id == drive.id).count()
-    drive_dict["student_count"] = db.query(Student).filter(Student.drive_id == drive.id).count()
+    drive_dict = serialize_drive(db, drive, with_counts=True)
 
     return {
         "success": True,
@@ -1290,10 +1235,12 @@ def end_exam(
 @router.get("/drives/{drive_id}/exam-status")
 def get_exam_status(
     drive_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     company: dict = Depends(get_company_user)
 ):
-    """Get the current exam status for the drive window"""
+    """Get the current exam status for the drive window (supports If-None-Match)"""
     drive = db.query(Drive).filter(
         Drive.id == drive_id,
         Drive.company_id == company.id
@@ -1303,7 +1250,7 @@ def get_exam_status(
         raise HTTPException(status_code=404, detail="Drive not found")
 
     # Check if students exist
-    student_count = db.query(Student).filter(Student.drive_id == drive_id).count()
+    student_count = drive.student_count
     has_students = student_count > 0
 
     # Calculate time remaining until window closes
@@ -1340,6 +1287,15 @@ def get_exam_status(
 
     # Convert time remaining to seconds for consistency
     time_remaining_seconds = int(time_remaining_minutes * 60) if time_remaining_minutes and time_remaining_minutes > 0 else None
+    drive_status = get_drive_status(drive, now)
+
+    # Tagged by the absolute end, not the countdown, so polls during the window can be 304s
+    etag = drive_etag(drive, exam_state, drive_status, window_end, time_remaining_minutes == 0)
+    cache_control = exam_status_cache_control(exam_state)
+    unchanged = not_modified(request, etag, cache_control)
+    if unchanged:
+        return unchanged
+    set_validators(response, etag, cache_control)
 
     return {
         "drive_id": drive_id,
@@ -1353,23 +1309,204 @@ def get_exam_status(
         "time_remaining_minutes": time_remaining_minutes,
         "can_start": drive.is_approved and not drive.actual_window_start and has_students,
         "can_end": drive.actual_window_start and not drive.actual_window_end,
-        "status": get_drive_status(drive),
+        "status": drive_status,
         "is_approved": drive.is_approved,
         "has_students": has_students,
         "student_count": student_count
     }
 
 
+@router.get("/drives/{drive_id}/events")
+def stream_drive_status_events(
+    drive_id: int,
+    db: Session = Depends(get_db),
+    company_id: int = Depends(get_effective_company_id)
+):
+    """Server-Sent Events stream of the drive's status and window changes"""
+    drive_exists = db.query(Drive.id).filter(
+        Drive.id == drive_id,
+        Drive.company_id == company_id
+    ).first()
+
+    if not drive_exists:
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    # get_db's cleanup only runs once the stream ends; give the connection back now
+    db.close()
+    return StreamingResponse(
+        stream_drive_events(drive_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 # ============= RESULTS ROUTES =============
 
+@router.post("/drives/{drive_id}/regrade")
+def regrade_drive_results(
+    drive_id: int,
+    db: Session = Depends(get_db),
+    company_id: int = Depends(get_effective_company_id)
+):
+    """Recompute response correctness and scores of a drive against its current answer key"""
+    drive = db.query(Drive).filter(
+        Drive.id == drive_id,
+        Drive.company_id == company_id
+    ).first()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    summary = regrade_drive(db, drive_id)
+
+    return {
+        "success": True,
+        "message": f"Regraded {summary['responses_checked']} responses; {summary['students_rescored']} student scores changed",
+        **summary
+    }
+
+
+@router.get("/drives/{drive_id}/analytics/questions")
+def get_question_analytics(
+    drive_id: int,
+    db: Session = Depends(get_db),
+    company_id: int = Depends(get_effective_company_id)
+):
+    """Per-question attempt rate, p-value, option distribution and discrimination"""
+    drive = db.query(Drive).filter(
+        Drive.id == drive_id,
+        Drive.company_id == company_id
+    ).first()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    # Responses of a completed drive are final, so its analysis is kept until a regrade
+    completed = get_drive_status(drive) == "completed"
+    version = (drive.updated_at, results_fingerprint(db, drive_id)) if completed else None
+    analysis = item_analysis_cache.get(drive_id, version) if completed else None
+    if analysis is None:
+        analysis = analyze_questions(db, drive_id)
+        if completed:
+            item_analysis_cache.put(drive_id, version, analysis)
+
+    return {"drive_title": drive.title, **analysis}
+
+
+@router.get("/drives/{drive_id}/leaderboard")
+def get_drive_leaderboard(
+    drive_id: int,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+    company_id: int = Depends(get_effective_company_id)
+):
+    """Top students of a drive by score (students tied at the cut-off are all included)"""
+    if not 1 <= limit <= MAX_RESULTS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_RESULTS_PAGE_SIZE}")
+
+    drive = db.query(Drive).filter(
+        Drive.id == drive_id,
+        Drive.company_id == company_id
+    ).first()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    ranked_students, top = leaderboards.top(db, drive_id, limit, final=get_drive_status(drive) == "completed")
+
+    students = {}
+    if top:
+        students = {
+            student.id: student for student in db.query(
+                Student.id, Student.name, Student.email, Student.roll_number,
+                Student.college_name, Student.student_group_name, Student.total_marks
+            ).filter(Student.id.in_([student_id for _, student_id, _ in top]))
+        }
+
+    leaderboard = []
+    for rank, student_id, score in top:
+        student = students.get(student_id)
+        if student is None:
+            continue  # Deleted since the board was built
+        leaderboard.append({
+            "rank": rank,
+            "id": student_id,
+            "name": student.name,
+            "email": student.email,
+            "roll_number": student.roll_number,
+            "college_name": student.college_name,
+            "student_group_name": student.student_group_name,
+            "score": score,
+            "total_marks": student.total_marks
+        })
+
+    return {
+        "drive_id": drive_id,
+        "ranked_students": ranked_students,
+        "leaderboard": leaderboard
+    }
+
+
+@router.get("/drives/{drive_id}/leaderboard/students/{student_id}")
+def get_student_standing(
+    drive_id: int,
+    student_id: int,
+    db: Session = Depends(get_db),
+    company_id: int = Depends(get_effective_company_id)
+):
+    """Rank and percentile of one student among the submitted students of a drive"""
+    drive = db.query(Drive).filter(
+        Drive.id == drive_id,
+        Drive.company_id == company_id
+    ).first()
+
+    if not drive:
+        raise HTTPException(status_code=404, detail="Drive not found")
+
+    standing = leaderboards.standing(db, drive_id, student_id, final=get_drive_status(drive) == "completed")
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Student has no ranked submission in this drive")
+
+    return {"drive_id": drive_id, "student_id": student_id, **standing}
+
+
 @router.get("/drives/{drive_id}/results")
 def get_drive_results(
     drive_id: int,
+    request: Request,
+    response: Response,
     min_percentage: Optional[float] = None,
+    max_percentage: Optional[float] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    college_name: Optional[str] = None,
+    student_group_name: Optional[str] = None,
+    result_status: Optional[str] = None,
+    min_violations: Optional[int] = None,
+    max_violations: Optional[int] = None,
+    sort_by: str = "name",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     company_id: int = Depends(get_effective_company_id)
 ):
-    """Get results for all students in a drive with optional percentage filter"""
+    """
+    Get results for the students of a drive.
+
+    Percentage, filters and sorting are evaluated in SQL. Pass limit to page
+    through the results: the response's next_cursor is passed back as cursor
+    to get the following page (null on the last page). Supports If-None-Match:
+    a repeated poll of an unchanged page is answered 304 after one aggregate query.
+    """
+    if sort_by not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if result_status is not None and result_status not in RESULT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"result_status must be one of: {', '.join(RESULT_STATUSES)}")
+    if limit is not None and not 1 <= limit <= MAX_RESULTS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_RESULTS_PAGE_SIZE}")
 
     # Verify drive belongs to company
     drive = db.query(Drive).filter(
@@ -1380,23 +1517,36 @@ def get_drive_results(
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
 
-    # Get all students for this drive
-    students = db.query(Student).filter(
-        Student.drive_id == drive_id
-    ).all()
-
-    results = []
-    for student in students:
-        # Calculate percentage
-        percentage = None
-        if student.total_marks and student.total_marks > 0:
-            percentage = (student.score / student.total_marks) * 100
+    etag = results_etag(drive, results_fingerprint(db, drive_id), request.url.query)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    set_validators(response, etag)
+
+    students = db.query(Student).filter(Student.drive_id == drive_id)
+    total_students = students.count()
+
+    filtered = filter_results(
+        students,
+        min_percentage=min_percentage,
+        max_percentage=max_percentage,
+        min_score=min_score,
+        max_score=max_score,
+        college_name=college_name,
+        student_group_name=student_group_name,
+        result_status=result_status,
+        min_violations=min_violations,
+        max_violations=max_violations
+    )
+    filtered_students = filtered.count()
 
-        # Apply filter if specified
-        if min_percentage is not None:
-            if percentage is None or percentage < min_percentage:
-                continue
+    try:
+        rows, next_cursor = page_results(filtered, sort_by, order == "desc", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    results = []
+    for student, percentage, _ in rows:
         results.append({
             "id": student.id,
             "name": student.name,
@@ -1419,22 +1569,21 @@ def get_drive_results(
     return {
         "drive_id": drive_id,
         "drive_title": drive.title,
-        "total_students": len(students),
-        "filtered_students": len(results),
-        "results": results
+        "total_students": total_students,
+        "filtered_students": filtered_students,
+        "results": results,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/drives/{drive_id}/results/export")
 def export_drive_results(
     drive_id: int,
-    format: str = "summary",  # "summary" or "detailed"
+    format: str = "summary",  # "summary", "detailed", "parquet" or "arrow"
     db: Session = Depends(get_db),
     company_id: int = Depends(get_effective_company_id)
 ):
-    """Export drive results as CSV (summary or detailed format)"""
-    from fastapi.responses import StreamingResponse
-    from app.models.student_response import StudentResponse as StudentResponseModel
+    """Export drive results as CSV (summary or detailed format) or as a Parquet / Arrow IPC file, streamed as rows are read"""
 
     # Verify drive belongs to company
     drive = db.query(Drive).filter(
@@ -1445,52 +1594,13 @@ def export_drive_results(
     if not drive:
         raise HTTPException(status_code=404, detail="Drive not found")
 
-    # Get all students for this drive
-    students = db.query(Student).filter(
-        Student.drive_id == drive_id
-    ).all()
-
+    # The body streams from its own session. get_db's cleanup only runs once the response
+    # has finished, so each branch gives the request's connection back before returning.
     if format == "summary":
         # Summary CSV: Name, Email, Roll Number, College, Student Group, Score, Total, Percentage, Status, Is_Disqualified
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow([
-            "Name", "Email", "Roll Number", "College", "Student Group", "Score", "Total",
-            "Percentage", "Status", "Is_Disqualified"
-        ])
-
-        # Write data
-        for student in students:
-            percentage = None
-            status = "Not Started"
-
-            if student.is_disqualified:
-                status = "Disqualified"
-            elif student.exam_submitted_at:
-                status = "Submitted"
-                if student.total_marks and student.total_marks > 0:
-                    percentage = (student.score / student.total_marks) * 100
-            elif student.exam_started_at:
-                status = "In Progress"
-
-            writer.writerow([
-                student.name,
-                student.email,
-                student.roll_number or "",
-                student.college_name or "",
-                student.student_group_name or "",
-                student.score if student.score is not None else "",
-                student.total_marks if student.total_marks is not None else "",
-                f"{percentage:.2f}" if percentage is not None else "",
-                status,
-                "Yes" if student.is_disqualified else "No"
-            ])
-
-        output.seek(0)
+        db.close()
         return StreamingResponse(
-            iter([output.getvalue()]),
+            stream_csv(SUMMARY_HEADER, lambda export_db: iter_summary_rows(export_db, drive_id)),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=drive_{drive_id}_results_summary.csv"
@@ -1499,95 +1609,50 @@ def export_drive_results(
 
     elif format == "detailed":
         # Detailed CSV: All summary columns + individual question columns (Q1, Q2, ...)
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Get all questions for this drive to determine number of columns
-        questions = db.query(Question).filter(
-            Question.drive_id == drive_id
-        ).order_by(Question.id).all()
-
-        num_questions = len(questions)
-        question_headers = [f"Q{i+1}" for i in range(num_questions)]
-
-        # Write header
-        header = [
-            "Name", "Email", "Roll Number", "College", "Student Group", "Score", "Total",
-            "Percentage", "Status", "Is_Disqualified"
-        ] + question_headers
-        writer.writerow(header)
-
-        # Write data for each student
-        for student in students:
-            percentage = None
-            status = "Not Started"
-
-            if student.is_disqualified:
-                status = "Disqualified"
-            elif student.exam_submitted_at:
-                status = "Submitted"
-                if student.total_marks and student.total_marks > 0:
-                    percentage = (student.score / student.total_marks) * 100
-            elif student.exam_started_at:
-                status = "In Progress"
-
-            # Get student's responses
-            responses = db.query(StudentResponseModel).filter(
-                StudentResponseModel.student_id == student.id
-            ).all()
-
-            # Create a mapping of question_id to response
-            response_map = {r.question_id: r for r in responses}
-
-            # Build question answers based on student's question_order
-            question_answers = []
-            if student.question_order:
-                for q_id in student.question_order:
-                    response = response_map.get(q_id)
-                    if response:
-                        # Show selected option and correctness
-                        if response.selected_option:
-                            correct_marker = "✓" if response.is_correct else "✗"
-                            question_answers.append(f"{response.selected_option.upper()} {correct_marker}")
-                        else:
-                            question_answers.append("Not Answered")
-                    else:
-                        question_answers.append("Not Answered")
-            else:
-                # If no question order (exam not started), fill with empty
-                question_answers = [""] * num_questions
-
-            # Pad or trim to match number of questions
-            while len(question_answers) < num_questions:
-                question_answers.append("")
-            question_answers = question_answers[:num_questions]
-
-            row = [
-                student.name,
-                student.email,
-                student.roll_number or "",
-                student.college_name or "",
-                student.student_group_name or "",
-                student.score if student.score is not None else "",
-                student.total_marks if student.total_marks is not None else "",
-                f"{percentage:.2f}" if percentage is not None else "",
-                status,
-                "Yes" if student.is_disqualified else "No"
-            ] + question_answers
-
-            writer.writerow(row)
-
-        output.seek(0)
+        question_ids = [
+            row.id for row in db.query(Question.id).filter(
+                Question.drive_id == drive_id
+            ).order_by(Question.id)
+        ]
+        question_headers = [f"Q{i+1}" for i in range(len(question_ids))]
+
+        db.close()
         return StreamingResponse(
-            iter([output.getvalue()]),
+            stream_csv(
+                SUMMARY_HEADER + question_headers,
+                lambda export_db: iter_detailed_rows(export_db, drive_id, question_ids)
+            ),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=drive_{drive_id}_results_detailed.csv"
             }
         )
 
+    elif format in COLUMNAR_FORMATS:
+        # Typed columnar file for analytics: student fields, result, violations and Q1, Q2, ...
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow to be installed")
+
+        question_ids = [
+            row.id for row in db.query(Question.id).filter(
+                Question.drive_id == drive_id
+            ).order_by(Question.id)
+        ]
+        media_type, extension = COLUMNAR_FORMATS[format]
+
+        db.close()
+        return StreamingResponse(
+            stream_columnar(drive_id, question_ids, format),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename=drive_{drive_id}_results.{extension}"
+            }
+        )
+
     else:
         raise HTTPException(
             status_code=400,
-            detail="Invalid format. Use 'summary' or 'detailed'"
+            detail="Invalid format. Use 'summary', 'detailed', 'parquet' or 'arrow'"
         )
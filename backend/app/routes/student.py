@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy import and_, insert, update
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 import random
 
 from app.database.connection import get_db
+from app.database.config import settings
 from app.models.student import Student
 from app.models.drive import Drive
-from app.models.question import Question
 from app.models.student_response import StudentResponse
+from app.utils.admission import admit_exam_request
+from app.utils.answer_key import AnswerKey
+from app.utils.drive_events import stream_drive_events, SSE_HEADERS
+from app.utils.drive_lifecycle import get_drive_status
+from app.utils.etag import not_modified, set_validators
+from app.utils.exam_cache import exam_cache
+from app.utils.exam_deadlines import schedule_student_deadline, cancel_student_deadline
+from app.utils.leaderboard import leaderboards
+from app.utils.question_order import generate_seed, derive_question_order, resolve_question_order
+from app.utils.response_versions import drive_etag
+from app.utils.student_auth_cache import student_auth_cache, CachedStudent
+from app.utils.violation_buffer import VIOLATION_TYPES, apply_violations, violation_buffer
 from app.schemas.student import (
     StudentLoginRequest, StudentAuthResponse, ExamDataResponse,
-    ExamQuestion, ViolationRequest, ViolationResponse,
+    ViolationRequest, ViolationResponse, ViolationBatchRequest,
     AnswerSubmission, ExamSubmissionRequest, ExamSubmissionResponse
 )
 
@@ -28,41 +41,16 @@ VIOLATION_THRESHOLDS = {
     "paste": None  # Warning only
 }
 
-def get_drive_status(drive: Drive) -> str:
-    """Calculate drive status on-the-fly based on current time and window times"""
-    if drive.status == "suspended":
-        return "suspended"
-    if drive.status in ["draft", "submitted", "rejected"]:
-        return drive.status
-    if not drive.is_approved:
-        return drive.status
+# Upper bound on events accepted by the batched violation endpoint
+MAX_VIOLATION_BATCH_SIZE = 100
 
-    now = datetime.utcnow()
-
-    # Check if drive has been manually ended
-    if drive.actual_window_end and now >= drive.actual_window_end:
-        return "completed"
-
-    # Check if drive is manually started and still active
-    if drive.actual_window_start:
-        # Calculate when window should end based on actual start
-        if drive.window_start and drive.window_end:
-            window_duration = drive.window_end - drive.window_start
-            expected_end = drive.actual_window_start + window_duration
-            if now >= expected_end:
-                return "completed"
-            return "live"
-
-    # Check scheduled window times
-    if drive.window_start and drive.window_end:
-        if now >= drive.window_end:
-            return "completed"
-        if now >= drive.window_start:
-            return "live"
-        if now < drive.window_start:
-            return "upcoming"
-
-    return drive.status
+def check_not_disqualified(student):
+    """Reject requests from disqualified students"""
+    if student.is_disqualified:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"You have been disqualified: {student.disqualification_reason}"
+        )
 
 # Dependency to get current student from token
 def get_current_student(token: str, db: Session = Depends(get_db)):
@@ -72,13 +60,34 @@ def get_current_student(token: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid access token"
         )
-    if student.is_disqualified:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"You have been disqualified: {student.disqualification_reason}"
-        )
+    student_auth_cache.put(student)
+    check_not_disqualified(student)
     return student
 
+# Dependency for read-mostly endpoints - returns a cached snapshot instead of the full row
+def get_cached_student(token: str, db: Session = Depends(get_db)) -> CachedStudent:
+    cached = student_auth_cache.get(token)
+    # A disqualified snapshot is re-read before rejecting (an admin reset may have cleared it)
+    if cached is None or cached.is_disqualified:
+        student = db.query(Student).filter(Student.access_token == token).first()
+        if not student:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid access token"
+            )
+        cached = student_auth_cache.put(student)
+    check_not_disqualified(cached)
+    return cached
+
+def reload_cached_student(db: Session, student: CachedStudent) -> CachedStudent:
+    """
+    Re-read a snapshot whose exam state is about to reject the request. Start,
+    submit and resets only invalidate the snapshot on the worker that handled
+    them, so another worker's copy can lag for STUDENT_AUTH_CACHE_TTL_SECONDS.
+    """
+    student_auth_cache.invalidate(student.access_token)
+    return get_cached_student(student.access_token, db)
+
 
 # ============= AUTHENTICATION ROUTES =============
 
@@ -126,7 +135,7 @@ def student_login(
 
 @router.get("/auth/validate")
 def validate_student_token(
-    student: Student = Depends(get_current_student)
+    student: CachedStudent = Depends(get_cached_student)
 ):
     """Validate if student token is still valid"""
     return {
@@ -139,10 +148,12 @@ def validate_student_token(
 
 @router.get("/drive-info")
 def get_drive_info(
-    student: Student = Depends(get_current_student),
+    request: Request,
+    response: Response,
+    student: CachedStudent = Depends(get_cached_student),
     db: Session = Depends(get_db)
 ):
-    """Get drive information including window times and exam duration"""
+    """Get drive information including window times and exam duration (supports If-None-Match)"""
     drive = db.query(Drive).filter(Drive.id == student.drive_id).first()
     if not drive:
         raise HTTPException(
@@ -150,6 +161,13 @@ def get_drive_info(
             detail="Drive not found"
         )
 
+    drive_status = get_drive_status(drive)  # Use calculated status
+    etag = drive_etag(drive, drive_status)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    set_validators(response, etag)
+
     return {
         "id": drive.id,
         "title": drive.title,
@@ -160,18 +178,36 @@ def get_drive_info(
         "window_end": drive.window_end,
         "actual_window_start": drive.actual_window_start,
         "actual_window_end": drive.actual_window_end,
-        "status": get_drive_status(drive)  # Use calculated status
+        "status": drive_status
     }
 
 
+@router.get("/drive-events")
+def stream_drive_status(
+    student: CachedStudent = Depends(get_cached_student),
+    db: Session = Depends(get_db)
+):
+    """Server-Sent Events stream of the student's drive status - replaces polling login/drive-info"""
+    # get_db's cleanup only runs once the stream ends; give the connection back now
+    db.close()
+    return StreamingResponse(
+        stream_drive_events(student.drive_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 # ============= EXAM ROUTES =============
 
-@router.post("/exam/start")
+@router.post("/exam/start", dependencies=[Depends(admit_exam_request)])
 def start_exam(
-    student: Student = Depends(get_current_student),
+    student: CachedStudent = Depends(get_cached_student),
     db: Session = Depends(get_db)
 ):
-    """Start the exam - generate randomized question order and check window eligibility"""
+    """Start the exam - stamp the start time and check window eligibility"""
+
+    if student.exam_started_at or student.exam_submitted_at:
+        student = reload_cached_student(db, student)
 
     # Check if already started
     if student.exam_started_at:
@@ -187,8 +223,12 @@ def start_exam(
             detail="Exam already submitted"
         )
 
-    # Get drive
-    drive = db.query(Drive).filter(Drive.id == student.drive_id).first()
+    # Window and status are read from the drive row: another worker may just have
+    # started, ended or suspended the drive. The cache only supplies the question set.
+    drive = db.query(
+        Drive.window_start, Drive.window_end, Drive.actual_window_start, Drive.actual_window_end,
+        Drive.is_approved, Drive.status, Drive.exam_duration_minutes, Drive.updated_at
+    ).filter(Drive.id == student.drive_id).first()
     if not drive:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -237,62 +277,78 @@ def start_exam(
             detail="Drive has been suspended"
         )
 
-    # Get all questions for this drive
-    questions = db.query(Question).filter(Question.drive_id == drive.id).all()
-    if not questions:
+    exam = exam_cache.get(db, student.drive_id, version=drive.updated_at)
+    if not exam or not exam.question_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No questions found for this drive"
         )
 
-    # Randomize question order
-    question_ids = [q.id for q in questions]
-    random.shuffle(question_ids)
-
-    # Update student record with individual exam start time
-    student.question_order = question_ids
-    student.exam_started_at = now
-    student.violation_details = {
-        "tab_switch": 0,
-        "fullscreen_exit": 0,
-        "right_click": 0,
-        "screenshot": 0,
-        "copy": 0,
-        "paste": 0
-    }
-
-    db.commit()
-    db.refresh(student)
-
-    # Calculate individual student's expected end time
-    from datetime import timedelta
     if not drive.exam_duration_minutes:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Drive exam duration not configured"
         )
-    student_expected_end = student.exam_started_at + timedelta(minutes=drive.exam_duration_minutes)
 
-    print(f"DEBUG START_EXAM - exam_started_at: {student.exam_started_at}")
-    print(f"DEBUG START_EXAM - duration_minutes: {drive.exam_duration_minutes}")
-    print(f"DEBUG START_EXAM - expected_end: {student_expected_end}")
+    # The question order and violation counters are normally prepared in bulk when the
+    # company starts the drive; only students without one get it generated here
+    values = {"exam_started_at": now}
+    if settings.question_order_mode == "list":
+        question_order = student.question_order
+        if not question_order:
+            question_order = list(exam.question_ids)
+            random.shuffle(question_order)
+            values["question_order"] = question_order
+    else:
+        question_seed = student.question_seed
+        if question_seed is None:
+            question_seed = generate_seed()
+            values["question_seed"] = question_seed
+        question_order = derive_question_order(question_seed, exam.question_ids)
+
+    # Single conditional UPDATE - also guards against a concurrent second start
+    result = db.execute(
+        update(Student)
+        .where(
+            Student.id == student.id,
+            Student.exam_started_at.is_(None),
+            Student.exam_submitted_at.is_(None)
+        )
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        student_auth_cache.invalidate(student.access_token)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exam already started"
+        )
+
+    db.commit()
+    violation_buffer.discard([student.id])
+    student_auth_cache.invalidate(student.access_token)
+    schedule_student_deadline(student.id, student.drive_id, now, drive.exam_duration_minutes)
+
+    # Calculate individual student's expected end time
+    student_expected_end = now + timedelta(minutes=drive.exam_duration_minutes)
 
     return {
         "success": True,
         "message": "Exam started successfully",
-        "exam_started_at": student.exam_started_at,
+        "exam_started_at": now,
         "expected_end": student_expected_end,
         "exam_duration_minutes": drive.exam_duration_minutes,
-        "question_order": student.question_order
+        "question_order": question_order
     }
 
 
-@router.get("/exam/questions", response_model=ExamDataResponse)
-def get_exam_questions(
-    student: Student = Depends(get_current_student),
-    db: Session = Depends(get_db)
-):
-    """Get all exam questions in the student's randomized order"""
+def load_exam_questions(student: CachedStudent, db: Session) -> tuple:
+    """
+    Database part of /exam/questions: checks and loads what the body is rendered
+    from, as (cached exam, question order, exam_started_at, expected_end)
+    """
+    if not student.exam_started_at or student.exam_submitted_at:
+        student = reload_cached_student(db, student)
 
     # Check if exam started
     if not student.exam_started_at:
@@ -308,119 +364,57 @@ def get_exam_questions(
             detail="Exam already submitted"
         )
 
-    # Get drive
-    drive = db.query(Drive).filter(Drive.id == student.drive_id).first()
-    if not drive:
+    # Get drive and its answer-free question set from the per-drive cache
+    exam = exam_cache.get(db, student.drive_id)
+    if not exam:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Drive not found"
         )
 
     # Get questions in the randomized order
-    question_order = student.question_order
+    question_order = resolve_question_order(student, exam.question_ids)
     if not question_order:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Question order not generated"
         )
 
-    # Fetch questions
-    questions = db.query(Question).filter(
-        Question.id.in_(question_order)
-    ).all()
-
-    # Sort questions according to student's order
-    questions_dict = {q.id: q for q in questions}
-    ordered_questions = [questions_dict[qid] for qid in question_order if qid in questions_dict]
-
-    # Calculate total marks
-    total_marks = sum(q.points for q in ordered_questions)
-
-    # Convert to response schema (without correct_answer)
-    exam_questions = [
-        ExamQuestion(
-            id=q.id,
-            question_text=q.question_text,
-            option_a=q.option_a,
-            option_b=q.option_b,
-            option_c=q.option_c,
-            option_d=q.option_d,
-            marks=q.points
-        )
-        for q in ordered_questions
-    ]
-
     # Calculate expected end time based on individual student's start time
-    expected_end = None
-    print(f"DEBUG - Checking expected_end calculation")
-    print(f"DEBUG - student.exam_started_at: {student.exam_started_at}")
-    print(f"DEBUG - drive.exam_duration_minutes: {drive.exam_duration_minutes}")
+    if not exam.exam_duration_minutes:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Drive exam duration not configured"
+        )
+    expected_end = student.exam_started_at + timedelta(minutes=exam.exam_duration_minutes)
+    return exam, question_order, student.exam_started_at, expected_end
 
-    if student.exam_started_at:
-        if not drive.exam_duration_minutes:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Drive exam duration not configured"
-            )
-        from datetime import timedelta
-        expected_end = student.exam_started_at + timedelta(minutes=drive.exam_duration_minutes)
-
-        # Debug logging
-        print(f"DEBUG - Student exam_started_at: {student.exam_started_at}")
-        print(f"DEBUG - Drive exam_duration_minutes: {drive.exam_duration_minutes}")
-        print(f"DEBUG - Calculated expected_end: {expected_end}")
-        print(f"DEBUG - Current time: {datetime.utcnow()}")
-        print(f"DEBUG - Time difference (seconds): {(expected_end - datetime.utcnow()).total_seconds()}")
-    else:
-        print(f"DEBUG - exam_started_at is None! This means exam hasn't been started via /exam/start endpoint")
+@router.get("/exam/questions", response_model=ExamDataResponse, dependencies=[Depends(admit_exam_request)])
+def get_exam_questions(
+    student: CachedStudent = Depends(get_cached_student),
+    db: Session = Depends(get_db)
+):
+    """Get all exam questions in the student's randomized order"""
+    exam, question_order, exam_started_at, expected_end = load_exam_questions(student, db)
 
-    response_data = ExamDataResponse(
-        drive_id=drive.id,
-        drive_title=drive.title,
-        drive_description=drive.description,
-        duration_minutes=drive.exam_duration_minutes,  # Use new field
-        scheduled_start=drive.window_start,  # Use new field
-        actual_start=drive.actual_window_start,  # Use new field
-        actual_end=drive.actual_window_end,  # Use new field
-        expected_end=expected_end,
-        question_count=len(exam_questions),
-        total_marks=total_marks,
-        questions=exam_questions,
-        student_question_order=question_order,
-        exam_started_at=student.exam_started_at
+    # Splice the pre-encoded questions in the student's order; the body matches
+    # ExamDataResponse, with datetimes serialized as UTC ISO strings
+    return Response(
+        content=exam.render(question_order, exam_started_at, expected_end),
+        media_type="application/json"
     )
 
-    # Convert to dict and ensure all datetimes are properly serialized as UTC ISO strings
-    response_dict = response_data.model_dump()
-
-    # Helper function to serialize datetime to UTC ISO string
-    def serialize_datetime(dt):
-        if isinstance(dt, datetime):
-            return dt.isoformat() + 'Z'
-        return dt
-
-    # Ensure all datetime fields are properly serialized
-    if response_dict.get('exam_started_at'):
-        response_dict['exam_started_at'] = serialize_datetime(response_dict['exam_started_at'])
-    if response_dict.get('expected_end'):
-        response_dict['expected_end'] = serialize_datetime(response_dict['expected_end'])
-    if response_dict.get('actual_end'):
-        response_dict['actual_end'] = serialize_datetime(response_dict['actual_end'])
-    if response_dict.get('scheduled_start'):
-        response_dict['scheduled_start'] = serialize_datetime(response_dict['scheduled_start'])
-    if response_dict.get('actual_start'):
-        response_dict['actual_start'] = serialize_datetime(response_dict['actual_start'])
-
-    return response_dict
-
 @router.post("/exam/violation", response_model=ViolationResponse)
 def record_violation(
     request: ViolationRequest,
-    student: Student = Depends(get_current_student),
+    student: CachedStudent = Depends(get_cached_student),
     db: Session = Depends(get_db)
 ):
     """Record a violation and check if student should be disqualified"""
 
+    if not student.exam_started_at or student.exam_submitted_at:
+        student = reload_cached_student(db, student)
+
     # Check if exam started
     if not student.exam_started_at:
         raise HTTPException(
@@ -442,37 +436,67 @@ def record_violation(
             detail="Invalid violation type"
         )
 
-    # Get current violations
-    violations = student.violation_details or {
-        "tab_switch": 0,
-        "fullscreen_exit": 0,
-        "right_click": 0,
-        "screenshot": 0,
-        "copy": 0,
-        "paste": 0
-    }
+    # Buffer the increment; counts are written to the database in batches
+    violations = violation_buffer.record(db, student.id, request.violation_type)
+    total_violations = sum(violations.values())
 
-    print(f"DEBUG: Before increment - {request.violation_type}: {violations[request.violation_type]}")
+    return ViolationResponse(
+        success=True,
+        is_disqualified=False,  # Always false since disqualification is handled by frontend
+        disqualification_reason=None,
+        current_violations=violations,
+        total_violations=total_violations
+    )
 
-    # Increment violation count
-    violations[request.violation_type] += 1
-    student.violation_details = violations
 
-    # Calculate total violations
-    total_violations = sum(violations.values())
-    student.total_violations = total_violations
+@router.post("/exam/violations/batch", response_model=ViolationResponse)
+def record_violations_batch(
+    request: ViolationBatchRequest,
+    student: CachedStudent = Depends(get_cached_student),
+    db: Session = Depends(get_db)
+):
+    """Record a burst of violation events in one request"""
 
-    print(f"DEBUG: After increment - {request.violation_type}: {violations[request.violation_type]}")
-    print(f"DEBUG: Total violations: {total_violations}")
+    if not student.exam_started_at or student.exam_submitted_at:
+        student = reload_cached_student(db, student)
 
-    db.commit()
-    db.refresh(student)
+    # Check if exam started
+    if not student.exam_started_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exam not started yet"
+        )
 
-    print(f"DEBUG: Final response - violations: {violations}, total: {total_violations}")
+    # Check if already submitted
+    if student.exam_submitted_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exam already submitted"
+        )
+
+    if len(request.events) > MAX_VIOLATION_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {MAX_VIOLATION_BATCH_SIZE} events"
+        )
+
+    # Validate every event before applying any of them
+    counts: Dict[str, int] = {}
+    for event in request.events:
+        if event.violation_type not in VIOLATION_THRESHOLDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid violation type: {event.violation_type}"
+            )
+        counts[event.violation_type] = counts.get(event.violation_type, 0) + 1
+
+    # All increments are applied to the buffer together and flushed in the same transaction
+    violations = violation_buffer.record_many(db, student.id, counts)
+    total_violations = sum(violations.values())
 
     return ViolationResponse(
         success=True,
-        is_disqualified=False,  # Always false since disqualification is handled by frontend
+        is_disqualified=False,  # Disqualification is handled by frontend
         disqualification_reason=None,
         current_violations=violations,
         total_violations=total_violations
@@ -510,36 +534,26 @@ def disqualify_student(
             detail="violation_type and reason are required"
         )
 
-    # Get current violations and increment the disqualification violation
-    violations = student.violation_details or {
-        "tab_switch": 0,
-        "fullscreen_exit": 0,
-        "right_click": 0,
-        "screenshot": 0,
-        "copy": 0,
-        "paste": 0
-    }
-
-    # Increment the violation that caused disqualification
-    if violation_type in violations:
-        violations[violation_type] += 1
+    # Write the buffered violations plus the one that caused disqualification
+    deltas = violation_buffer.take(student.id)
+    if violation_type in VIOLATION_TYPES:
+        deltas[violation_type] = deltas.get(violation_type, 0) + 1
+    violations = apply_violations(db, student.id, deltas)
+    total_violations = sum(violations.values())
 
     # Update student record
     student.is_disqualified = True
     student.disqualification_reason = reason
-    student.violation_details = violations
 
     # Mark exam as submitted with 0 score
     student.exam_submitted_at = datetime.utcnow()
     student.score = 0
     student.total_marks = 0
 
-    # Calculate total violations
-    total_violations = sum(violations.values())
-    student.total_violations = total_violations
-
     db.commit()
     db.refresh(student)
+    student_auth_cache.invalidate(student.access_token)
+    cancel_student_deadline(student.id)
 
     print(f"DEBUG: Student {student.id} DISQUALIFIED! Reason: {reason}, Total violations: {total_violations}")
 
@@ -551,13 +565,8 @@ def disqualify_student(
     }
 
 
-@router.post("/exam/submit", response_model=ExamSubmissionResponse)
-def submit_exam(
-    request: ExamSubmissionRequest,
-    student: Student = Depends(get_current_student),
-    db: Session = Depends(get_db)
-):
-    """Submit exam with all answers"""
+def load_answer_key(student: Student, db: Session) -> AnswerKey:
+    """Database part of /exam/submit before grading: checks and loads the drive's answer key"""
 
     # Check if exam started
     if not student.exam_started_at:
@@ -573,74 +582,66 @@ def submit_exam(
             detail="Exam already submitted"
         )
 
-    # Get drive to calculate total marks from ALL questions
-    drive = db.query(Drive).filter(Drive.id == student.drive_id).first()
-    if not drive:
+    # Compiled answer key of the drive (cached once the drive is approved)
+    answer_key = exam_cache.get_answer_key(db, student.drive_id)
+    if answer_key is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Drive not found"
         )
+    return answer_key
+
+def grade_submission(student_id: int, drive_id: int, answer_key: AnswerKey, request: ExamSubmissionRequest) -> tuple:
+    """Grade a submission and build its response rows (no database access) as (score, rows, answered_at)"""
+    score, results = answer_key.grade(request.answers)
+
+    # Build response rows (answers to questions outside the drive are ignored)
+    answered_at = datetime.utcnow()
+    response_rows = [
+        {
+            "student_id": student_id,
+            "question_id": answer.question_id,
+            "drive_id": drive_id,
+            "selected_option": answer.selected_option,
+            "is_correct": is_correct,
+            "marked_for_review": answer.marked_for_review,
+            "answered_at": answered_at
+        }
+        for answer, is_correct in zip(request.answers, results)
+        if is_correct is not None
+    ]
+    return score, response_rows, answered_at
 
-    # Get ALL questions for this drive to calculate correct total_marks
-    all_questions = db.query(Question).filter(Question.drive_id == drive.id).all()
-    total_marks = sum(q.points for q in all_questions)
-
-    # Get questions for scoring (only those that were answered)
-    question_ids = [ans.question_id for ans in request.answers]
-    questions = db.query(Question).filter(
-        Question.id.in_(question_ids)
-    ).all()
-    questions_dict = {q.id: q for q in questions}
-
-    # Calculate score and save responses
-    score = 0
-
-    for answer in request.answers:
-        question = questions_dict.get(answer.question_id)
-        if not question:
-            continue
-
-        is_correct = False
-
-        if answer.selected_option:
-            selected = answer.selected_option.upper()
-            correct = question.correct_answer.upper()
-
-            if selected == correct:
-                score += question.points
-                is_correct = True
-            elif selected == 'A' and correct == question.option_a.upper():
-                score += question.points
-                is_correct = True
-            elif selected == 'B' and correct == question.option_b.upper():
-                score += question.points
-                is_correct = True
-            elif selected == 'C' and correct == question.option_c.upper():
-                score += question.points
-                is_correct = True
-            elif selected == 'D' and correct == question.option_d.upper():
-                score += question.points
-                is_correct = True
-
-        # Create student response record
-        response = StudentResponse(
-            student_id=student.id,
-            question_id=answer.question_id,
-            drive_id=student.drive_id,
-            selected_option=answer.selected_option,
-            is_correct=is_correct,
-            marked_for_review=answer.marked_for_review,
-            answered_at=datetime.utcnow()
-        )
-        db.add(response)
+def save_submission(
+    student: Student,
+    answer_key: AnswerKey,
+    graded: tuple,
+    db: Session
+) -> ExamSubmissionResponse:
+    """Database part of /exam/submit after grading: store the responses and the score and commit"""
+    score, response_rows, answered_at = graded
+
+    # Total marks come from ALL questions of the drive, not just the answered ones
+    total_marks = answer_key.total_marks
+
+    # Save all responses with a single executemany INSERT (no ORM objects per answer)
+    if response_rows:
+        db.execute(insert(StudentResponse), response_rows)
 
     # Update student record
     student.score = score
     student.total_marks = total_marks
-    student.exam_submitted_at = datetime.utcnow()
+    student.exam_submitted_at = answered_at
+
+    # Write any buffered violations along with the submission
+    pending_violations = violation_buffer.take(student.id)
+    if pending_violations:
+        apply_violations(db, student.id, pending_violations)
 
     db.commit()
-    db.refresh(student)
+    student_auth_cache.invalidate(student.access_token)
+    cancel_student_deadline(student.id)
+    leaderboards.record(student.drive_id, student.id, score)
 
     percentage = (score / total_marks * 100) if total_marks > 0 else 0
 
@@ -649,11 +650,22 @@ def submit_exam(
         score=score,
         total_marks=total_marks,
         percentage=round(percentage, 2),
-        submitted_at=student.exam_submitted_at
+        submitted_at=answered_at
     )
 
+@router.post("/exam/submit", response_model=ExamSubmissionResponse, dependencies=[Depends(admit_exam_request)])
+def submit_exam(
+    request: ExamSubmissionRequest,
+    student: Student = Depends(get_current_student),
+    db: Session = Depends(get_db)
+):
+    """Submit exam with all answers"""
+    answer_key = load_answer_key(student, db)
+    graded = grade_submission(student.id, student.drive_id, answer_key, request)
+    return save_submission(student, answer_key, graded, db)
+
 
-@router.get("/exam/result")
+@router.get("/exam/result", dependencies=[Depends(admit_exam_request)])
 def get_exam_result(
     student: Student = Depends(get_current_student),
     db: Session = Depends(get_db)
@@ -667,7 +679,7 @@ def get_exam_result(
             detail="Exam not submitted yet"
         )
 
-    # Get drive to calculate correct total_marks from ALL questions
+    # Get drive to use the correct total_marks of ALL questions
     drive = db.query(Drive).filter(Drive.id == student.drive_id).first()
     if not drive:
         raise HTTPException(
@@ -675,9 +687,8 @@ def get_exam_result(
             detail="Drive not found"
         )
 
-    # Recalculate total_marks from ALL questions (fix for old submissions with wrong stored total_marks)
-    all_questions = db.query(Question).filter(Question.drive_id == drive.id).all()
-    correct_total_marks = sum(q.points for q in all_questions)
+    # Total points of the drive's questions (fix for old submissions with wrong stored total_marks)
+    correct_total_marks = drive.total_points
 
     # Use the correct total_marks for percentage calculation
     # Handle case where score is None (exam manually ended without submission)
@@ -0,0 +1,118 @@
+"""
+Async variants of the hot student exam endpoints (enabled with ASYNC_STUDENT_ROUTES=true).
+
+Each endpoint runs the same handler as routes/student.py through
+AsyncSession.run_sync: the handler code is shared, but every database round trip
+goes through the async engine on the event loop instead of occupying one of
+Starlette's worker threads. run_sync executes on the event loop itself, so the
+CPU-heavy steps (rendering the question set, grading a submission) are split
+out of their handlers and run in the threadpool between the database steps. The router is mounted ahead of the sync one, so
+these paths take precedence and every other student endpoint stays sync.
+"""
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.database.connection import get_async_db
+from app.models.student import Student
+from app.routes import student as sync_routes
+from app.schemas.student import (
+    StudentLoginRequest, StudentAuthResponse, ExamDataResponse,
+    ViolationRequest, ViolationResponse, ViolationBatchRequest,
+    ExamSubmissionRequest, ExamSubmissionResponse
+)
+from app.utils.admission import admit_async_exam_request
+from app.utils.student_auth_cache import CachedStudent
+
+router = APIRouter()
+
+
+async def run_handler(db: AsyncSession, handler, **kwargs):
+    """Run a sync route handler against the async session's connection"""
+    return await db.run_sync(lambda session: handler(db=session, **kwargs))
+
+# Dependency to get current student from token
+async def get_current_student_async(token: str, db: AsyncSession = Depends(get_async_db)) -> Student:
+    return await run_handler(db, sync_routes.get_current_student, token=token)
+
+# Dependency for read-mostly endpoints - returns a cached snapshot instead of the full row
+async def get_cached_student_async(token: str, db: AsyncSession = Depends(get_async_db)) -> CachedStudent:
+    return await run_handler(db, sync_routes.get_cached_student, token=token)
+
+
+# ============= AUTHENTICATION ROUTES =============
+
+@router.post("/auth/login", response_model=StudentAuthResponse)
+async def student_login_async(
+    request: StudentLoginRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Login student with email and access token"""
+    return await run_handler(db, sync_routes.student_login, request=request)
+
+
+# ============= EXAM ROUTES =============
+
+@router.post("/exam/start", dependencies=[Depends(admit_async_exam_request)])
+async def start_exam_async(
+    student: CachedStudent = Depends(get_cached_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Start the exam - stamp the start time and check window eligibility"""
+    return await run_handler(db, sync_routes.start_exam, student=student)
+
+
+@router.get("/exam/questions", response_model=ExamDataResponse, dependencies=[Depends(admit_async_exam_request)])
+async def get_exam_questions_async(
+    student: CachedStudent = Depends(get_cached_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all exam questions in the student's randomized order"""
+    exam, question_order, exam_started_at, expected_end = await run_handler(
+        db, sync_routes.load_exam_questions, student=student
+    )
+    # Rendering is CPU work; keep it off the event loop
+    body = await run_in_threadpool(exam.render, question_order, exam_started_at, expected_end)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/exam/violation", response_model=ViolationResponse)
+async def record_violation_async(
+    request: ViolationRequest,
+    student: CachedStudent = Depends(get_cached_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Record a violation and check if student should be disqualified"""
+    return await run_handler(db, sync_routes.record_violation, request=request, student=student)
+
+
+@router.post("/exam/violations/batch", response_model=ViolationResponse)
+async def record_violations_batch_async(
+    request: ViolationBatchRequest,
+    student: CachedStudent = Depends(get_cached_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Record a burst of violation events in one request"""
+    return await run_handler(db, sync_routes.record_violations_batch, request=request, student=student)
+
+
+@router.post("/exam/submit", response_model=ExamSubmissionResponse, dependencies=[Depends(admit_async_exam_request)])
+async def submit_exam_async(
+    request: ExamSubmissionRequest,
+    student: Student = Depends(get_current_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Submit exam with all answers"""
+    answer_key = await run_handler(db, sync_routes.load_answer_key, student=student)
+    # Grading is CPU work; keep it off the event loop
+    graded = await run_in_threadpool(sync_routes.grade_submission, student.id, student.drive_id, answer_key, request)
+    return await run_handler(db, sync_routes.save_submission, student=student, answer_key=answer_key, graded=graded)
+
+
+@router.get("/exam/result", dependencies=[Depends(admit_async_exam_request)])
+async def get_exam_result_async(
+    student: Student = Depends(get_current_student_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get student's exam result"""
+    return await run_handler(db, sync_routes.get_exam_result, student=student)
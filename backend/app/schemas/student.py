@@ -51,6 +51,14 @@ class ExamDataResponse(BaseModel):
 class ViolationRequest(BaseModel):
     violation_type: str  # 'tab_switch', 'fullscreen_exit', 'right_click', 'screenshot', 'copy', 'paste'
 
+# Schema for a single violation event in a batch
+class ViolationEvent(BaseModel):
+    violation_type: str
+
+# Schema for batched violation request
+class ViolationBatchRequest(BaseModel):
+    events: List[ViolationEvent]
+
 # Schema for violation response
 class ViolationResponse(BaseModel):
     success: bool
@@ -90,6 +98,7 @@ class StudentResponse(BaseModel):
     student_group_name: Optional[str] = None
     access_token: str
     question_order: Optional[List[int]] = None
+    question_seed: Optional[int] = None
     exam_started_at: Optional[datetime] = None
     exam_submitted_at: Optional[datetime] = None
     score: Optional[int] = None
@@ -0,0 +1,158 @@
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from fastapi import HTTPException, status
+from app.database.config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request can not be admitted (queue full or waited too long)"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounded concurrency gate with a fair (FIFO) wait queue.
+
+    At most max_concurrent requests hold a slot at a time; the rest wait in
+    arrival order, and a released slot is handed straight to the oldest
+    waiter so newcomers cannot overtake the queue. Requests are rejected when
+    the queue is full or after waiting queue_timeout_seconds, so a start-of-exam
+    spike turns into short waits and retries instead of database pool
+    timeouts. All state is touched only from the event loop.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout_seconds: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+
+        # Metrics
+        self.admitted_total = 0
+        self.queued_total = 0
+        self.rejected_queue_full_total = 0
+        self.rejected_timeout_total = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    async def acquire(self):
+        """Wait for a slot; raises AdmissionRejected if none becomes available in time"""
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self.admitted_total += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full_total += 1
+            raise AdmissionRejected("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        queued_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected_timeout_total += 1
+            raise AdmissionRejected("queue timeout")
+        finally:
+            self.total_wait_seconds += time.monotonic() - queued_at
+
+        self.admitted_total += 1
+
+    def release(self):
+        """Free a slot, handing it to the oldest waiter if there is one"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter; the active count is unchanged
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def retry_after_seconds(self) -> int:
+        """Suggested Retry-After with jitter, so rejected clients do not come back in lockstep"""
+        base = settings.exam_admission_retry_after_seconds
+        return math.ceil(base * random.uniform(1.0, 2.0))
+
+    def metrics(self) -> dict:
+        """Current queue state and counters"""
+        return {
+            "enabled": self.enabled,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout_seconds,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted_total": self.admitted_total,
+            "queued_total": self.queued_total,
+            "rejected_queue_full_total": self.rejected_queue_full_total,
+            "rejected_timeout_total": self.rejected_timeout_total,
+            "average_wait_ms": round(self.total_wait_seconds / self.queued_total * 1000, 2) if self.queued_total else 0.0
+        }
+
+
+# Gate for the sync student routes, sized below the sync pool
+exam_admission = AdmissionController(
+    max_concurrent=settings.exam_admission_max_concurrent,
+    max_queue=settings.exam_admission_max_queue,
+    queue_timeout_seconds=settings.exam_admission_queue_timeout_seconds
+)
+
+# Gate for the async student routes (ASYNC_STUDENT_ROUTES), sized from the async engine's pool
+async_exam_admission = AdmissionController(
+    max_concurrent=settings.exam_admission_async_max_concurrent,
+    max_queue=settings.exam_admission_max_queue,
+    queue_timeout_seconds=settings.exam_admission_queue_timeout_seconds
+)
+
+
+def admission_dependency(controller: AdmissionController):
+    """Dependency that holds a slot of the given controller for the duration of a student exam request"""
+
+    async def admit():
+        if not controller.enabled:
+            yield
+            return
+
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Server is busy ({e.reason}), please retry shortly",
+                headers={"Retry-After": str(controller.retry_after_seconds())}
+            )
+
+        try:
+            yield
+        finally:
+            controller.release()
+
+    return admit
+
+
+admit_exam_request = admission_dependency(exam_admission)
+admit_async_exam_request = admission_dependency(async_exam_admission)
@@ -0,0 +1,63 @@
+from array import array
+from typing import Iterable, List, Optional, Tuple
+from app.models.question import Question
+from app.schemas.student import AnswerSubmission
+
+OPTION_LETTERS = "ABCD"
+
+# Selected option -> bit of that option in an accepted-options mask
+OPTION_BITS = {}
+for _index, _letter in enumerate(OPTION_LETTERS):
+    OPTION_BITS[_letter] = OPTION_BITS[_letter.lower()] = 1 << _index
+
+
+def accepted_options_mask(question: Question) -> int:
+    """
+    Bitmask of the options that are graded as correct for a question.
+
+    correct_answer is either the option letter or the option text, so an
+    option is accepted if its letter or its text matches (case-insensitively).
+    """
+    correct = question.correct_answer.upper()
+    mask = 0
+    for index, letter in enumerate(OPTION_LETTERS):
+        option_text = getattr(question, f"option_{letter.lower()}")
+        if correct == letter or option_text.upper() == correct:
+            mask |= 1 << index
+    return mask
+
+
+class AnswerKey:
+    """
+    Compiled answer key of a drive.
+
+    Questions are stored by position in compact arrays (accepted-options mask
+    and points); grading is a dict lookup and a bitwise AND per answer, with
+    no string handling.
+    """
+
+    def __init__(self, questions: Iterable[Question]):
+        ordered = sorted(questions, key=lambda q: q.id)
+        self.positions = {q.id: position for position, q in enumerate(ordered)}
+        self.accepted = array("B", (accepted_options_mask(q) for q in ordered))
+        self.points = array("l", (q.points for q in ordered))
+        self.total_marks = sum(self.points)
+
+    def grade(self, answers: List[AnswerSubmission]) -> Tuple[int, List[Optional[bool]]]:
+        """
+        Grade a submission.
+
+        Returns the score and, per answer, whether it is correct (None for
+        answers to questions that are not part of this drive).
+        """
+        positions = [self.positions.get(answer.question_id) for answer in answers]
+        results = [
+            None if position is None else bool(self.accepted[position] & OPTION_BITS.get(answer.selected_option, 0))
+            for position, answer in zip(positions, answers)
+        ]
+        score = sum(
+            self.points[position]
+            for position, is_correct in zip(positions, results)
+            if is_correct
+        )
+        return score, results
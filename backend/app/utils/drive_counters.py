@@ -0,0 +1,78 @@
+"""
+Denormalized per-drive counters: Drive.question_count, Drive.student_count and
+Drive.total_points (sum of question points).
+
+Every path that adds or removes questions or students calls
+adjust_drive_counters() in the same transaction. The increment is done in
+SQL (column = column + delta), so concurrent uploads cannot lose updates.
+reconcile_drive_counters() recomputes the columns from the child tables;
+it runs automatically when the columns are first added and is available as
+`python -m app.manage reconcile-drive-counters`.
+"""
+from typing import Optional
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from app.models import Drive, Question, Student
+
+def adjust_drive_counters(db: Session, drive_id: int, questions: int = 0, students: int = 0, points: int = 0):
+    """Add deltas to a drive's counters (does not commit)"""
+    values = {}
+    if questions:
+        values["question_count"] = Drive.question_count + questions
+    if students:
+        values["student_count"] = Drive.student_count + students
+    if points:
+        values["total_points"] = Drive.total_points + points
+    if not values:
+        return
+
+    db.execute(
+        update(Drive)
+        .where(Drive.id == drive_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    # A loaded Drive object must not keep serving the old counts
+    drive = db.identity_map.get(identity_key(Drive, drive_id))
+    if drive is not None:
+        db.expire(drive, list(values))
+
+
+def reconcile_drive_counters(db: Session, drive_id: Optional[int] = None) -> int:
+    """
+    Recompute the counters of every drive (or one drive) from the questions
+    and students tables and fix the ones that drifted. Commits; returns the
+    number of drives corrected.
+    """
+    question_totals = db.query(
+        Question.drive_id, func.count(Question.id), func.coalesce(func.sum(Question.points), 0)
+    ).group_by(Question.drive_id)
+    student_totals = db.query(Student.drive_id, func.count(Student.id)).group_by(Student.drive_id)
+    drives = db.query(Drive.id, Drive.question_count, Drive.student_count, Drive.total_points, Drive.updated_at)
+
+    if drive_id is not None:
+        question_totals = question_totals.filter(Question.drive_id == drive_id)
+        student_totals = student_totals.filter(Student.drive_id == drive_id)
+        drives = drives.filter(Drive.id == drive_id)
+
+    questions = {row[0]: (row[1], row[2]) for row in question_totals}
+    students = dict(student_totals.all())
+
+    corrections = []
+    for drive in drives:
+        question_count, total_points = questions.get(drive.id, (0, 0))
+        student_count = students.get(drive.id, 0)
+        if (drive.question_count, drive.student_count, drive.total_points) != (question_count, student_count, total_points):
+            corrections.append({
+                "id": drive.id,
+                "question_count": question_count,
+                "student_count": student_count,
+                "total_points": total_points,
+                "updated_at": drive.updated_at  # A correction is not an edit of the drive
+            })
+
+    if corrections:
+        db.execute(update(Drive), corrections)
+    db.commit()
+    return len(corrections)
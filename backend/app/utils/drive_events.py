@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import orjson
+from datetime import datetime
+from typing import Dict, Optional, Set
+from starlette.concurrency import run_in_threadpool
+from app.database.config import settings
+from app.database.connection import SessionLocal
+from app.models import Drive
+from app.utils.drive_lifecycle import get_drive_status, status_transition_times
+from app.utils.exam_cache import JSON_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber; a slow client only ever needs the latest one
+SUBSCRIBER_QUEUE_SIZE = 8
+
+BOUNDARY_SLACK_SECONDS = 0.05
+
+# Keep proxies from buffering or caching the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class DriveSnapshot:
+    """The drive fields the status computation and the event payload need"""
+
+    def __init__(self, drive: Drive):
+        self.id = drive.id
+        self.title = drive.title
+        self.description = drive.description
+        self.category = drive.category
+        self.exam_duration_minutes = drive.exam_duration_minutes
+        self.window_start = drive.window_start
+        self.window_end = drive.window_end
+        self.actual_window_start = drive.actual_window_start
+        self.actual_window_end = drive.actual_window_end
+        self.status = drive.status
+        self.is_approved = drive.is_approved
+
+
+def load_snapshot(drive_id: int) -> Optional[DriveSnapshot]:
+    db = SessionLocal()
+    try:
+        drive = db.query(Drive).filter(Drive.id == drive_id).first()
+        return DriveSnapshot(drive) if drive else None
+    finally:
+        db.close()
+
+
+def build_payload(snapshot: DriveSnapshot) -> dict:
+    """Event payload - the same shape as the student drive-info response"""
+    return {
+        "id": snapshot.id,
+        "title": snapshot.title,
+        "description": snapshot.description,
+        "category": snapshot.category,
+        "exam_duration_minutes": snapshot.exam_duration_minutes,
+        "window_start": snapshot.window_start,
+        "window_end": snapshot.window_end,
+        "actual_window_start": snapshot.actual_window_start,
+        "actual_window_end": snapshot.actual_window_end,
+        "status": get_drive_status(snapshot)
+    }
+
+
+class _DriveChannel:
+    def __init__(self):
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.changed = asyncio.Event()
+        self.last_payload: Optional[dict] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class DriveEventHub:
+    """
+    In-process fan-out of drive status changes (one hub per worker).
+
+    Each drive with at least one subscriber has a single watcher task. The
+    watcher reads the drive row once, then recomputes the status locally at
+    the window boundaries. It re-reads the row only when notify() is called
+    (drive changed in this worker) or every refresh_seconds (changes made by
+    other workers). Subscribers themselves never touch the database.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._channels: Dict[int, _DriveChannel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def subscribe(self, drive_id: int) -> asyncio.Queue:
+        """Register a subscriber; the current state is delivered first if known"""
+        self._loop = asyncio.get_running_loop()
+        channel = self._channels.get(drive_id)
+        if channel is None:
+            channel = self._channels[drive_id] = _DriveChannel()
+            channel.task = asyncio.create_task(self._watch(drive_id, channel))
+
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        if channel.last_payload is not None:
+            queue.put_nowait(channel.last_payload)
+        channel.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, drive_id: int, queue: asyncio.Queue):
+        """Remove a subscriber; the drive's watcher stops with its last subscriber"""
+        channel = self._channels.get(drive_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            del self._channels[drive_id]
+            channel.task.cancel()
+
+    def notify(self, drive_id: int):
+        """Signal that a drive row changed; safe to call from sync route handlers"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or drive_id not in self._channels:
+            return
+        loop.call_soon_threadsafe(self._set_changed, drive_id)
+
+    def _set_changed(self, drive_id: int):
+        channel = self._channels.get(drive_id)
+        if channel is not None:
+            channel.changed.set()
+
+    def subscriber_count(self) -> int:
+        return sum(len(channel.subscribers) for channel in self._channels.values())
+
+    def _publish(self, channel: _DriveChannel, payload: dict):
+        channel.last_payload = payload
+        for queue in channel.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _watch(self, drive_id: int, channel: _DriveChannel):
+        try:
+            while True:
+                try:
+                    if not await self._follow(drive_id, channel):
+                        return
+                except Exception as e:
+                    # Keep watching: the subscribers' streams would otherwise go silent for good
+                    logger.error(f"Drive {drive_id} event watcher failed: {str(e)}")
+                    await asyncio.sleep(self.refresh_seconds)
+        except asyncio.CancelledError:
+            pass
+
+    async def _follow(self, drive_id: int, channel: _DriveChannel) -> bool:
+        """Load the drive and publish its state until it changes or is due for a reload; False once deleted"""
+        channel.changed.clear()
+        snapshot = await run_in_threadpool(load_snapshot, drive_id)
+        if snapshot is None:
+            self._publish(channel, {"id": drive_id, "status": "deleted"})
+            return False
+
+        reload_at = asyncio.get_running_loop().time() + self.refresh_seconds
+        while True:
+            payload = build_payload(snapshot)
+            if payload != channel.last_payload:
+                self._publish(channel, payload)
+
+            # Sleep until the next window boundary, a change notification or the refresh
+            now = datetime.utcnow()
+            upcoming = [(t - now).total_seconds() for t in status_transition_times(snapshot) if t > now]
+            until_reload = reload_at - asyncio.get_running_loop().time()
+            # (a little past the boundary, so the recomputed status has already flipped)
+            timeout = max(0.0, min([seconds + BOUNDARY_SLACK_SECONDS for seconds in upcoming] + [until_reload]))
+            try:
+                await asyncio.wait_for(channel.changed.wait(), timeout)
+                return True
+            except asyncio.TimeoutError:
+                if asyncio.get_running_loop().time() >= reload_at:
+                    return True
+
+
+drive_events = DriveEventHub(refresh_seconds=settings.drive_events_refresh_seconds)
+
+
+def format_event(payload: dict) -> bytes:
+    """Encode a payload as a Server-Sent Events 'status' event"""
+    return b"event: status\ndata: " + orjson.dumps(payload, option=JSON_OPTIONS) + b"\n\n"
+
+
+async def stream_drive_events(drive_id: int):
+    """SSE body for a drive: status events as they happen, plus keep-alive comments"""
+    queue = await drive_events.subscribe(drive_id)
+    try:
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), settings.drive_events_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield format_event(payload)
+            if payload.get("status") == "deleted":
+                return
+    finally:
+        drive_events.unsubscribe(drive_id, queue)
@@ -0,0 +1,185 @@
+"""
+Drive lifecycle: computes a drive's status from its window times and persists
+it on the row at the exact boundary times, so Drive.status is authoritative
+and can be filtered on in SQL.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database.config import settings
+from app.database.connection import SessionLocal
+from app.models import Drive
+from app.utils.exam_deadlines import DeadlineScheduler
+
+logger = logging.getLogger(__name__)
+
+# Statuses that are derived from the window times (only for approved drives)
+TIME_BASED_STATUSES = ("upcoming", "live", "completed")
+
+# Statuses set explicitly by the company/admin workflow; never overwritten by the timer
+MANUAL_STATUSES = ("draft", "submitted", "rejected", "suspended")
+
+# Max drives processed per timer batch
+LIFECYCLE_BATCH_SIZE = 200
+
+
+def get_drive_status(drive, now: Optional[datetime] = None) -> str:
+    """Calculate drive status based on current time and window times"""
+    if drive.status == "suspended":
+        return "suspended"
+    if drive.status in ["draft", "submitted", "rejected"]:
+        return drive.status
+    if not drive.is_approved:
+        return drive.status
+
+    if now is None:
+        now = datetime.utcnow()
+
+    # Check if drive has been manually ended
+    if drive.actual_window_end and now >= drive.actual_window_end:
+        return "completed"
+
+    # Check if drive is manually started and still active
+    if drive.actual_window_start:
+        # Calculate when window should end based on actual start
+        if drive.window_start and drive.window_end:
+            window_duration = drive.window_end - drive.window_start
+            expected_end = drive.actual_window_start + window_duration
+            if now >= expected_end:
+                return "completed"
+            return "live"
+
+    # Check scheduled window times
+    if drive.window_start and drive.window_end:
+        if now >= drive.window_end:
+            return "completed"
+        if now >= drive.window_start:
+            return "live"
+        if now < drive.window_start:
+            return "upcoming"
+
+    return drive.status
+
+
+def status_transition_times(drive) -> List[datetime]:
+    """Points in time at which get_drive_status can change without the row changing"""
+    times = [drive.window_start, drive.window_end, drive.actual_window_end]
+    if drive.actual_window_start and drive.window_start and drive.window_end:
+        times.append(drive.actual_window_start + (drive.window_end - drive.window_start))
+    return [t for t in times if t is not None]
+
+
+drive_status_timers = DeadlineScheduler()
+
+
+def apply_drive_status(drive: Drive, now: Optional[datetime] = None) -> bool:
+    """
+    Store the computed status on the drive and schedule its next transition.
+
+    Call before committing whenever a drive's approval, status or window
+    times change. Returns True if the stored status changed.
+    """
+    key = ("drive-status", drive.id)
+    if drive.status in MANUAL_STATUSES or not drive.is_approved:
+        drive_status_timers.cancel(key)
+        return False
+
+    if now is None:
+        now = datetime.utcnow()
+
+    status = get_drive_status(drive, now)
+    changed = status != drive.status
+    drive.status = status
+
+    upcoming = [t for t in status_transition_times(drive) if t > now]
+    if upcoming:
+        drive_status_timers.schedule(key, min(upcoming))
+    else:
+        drive_status_timers.cancel(key)
+
+    return changed
+
+
+def apply_all_drive_statuses(db: Session) -> int:
+    """Persist the current status of every approved drive and schedule their transitions"""
+    changed = 0
+    drives = db.query(Drive).filter(
+        Drive.is_approved == True,
+        Drive.status.notin_(MANUAL_STATUSES)
+    ).all()
+    for drive in drives:
+        if apply_drive_status(drive):
+            changed += 1
+    db.commit()
+    return changed
+
+
+def apply_due_transitions(now: datetime) -> List[int]:
+    """Persist the status of drives whose boundary has passed; returns the ids that changed"""
+    due = drive_status_timers.pop_due(now, LIFECYCLE_BATCH_SIZE)
+    if not due:
+        return []
+
+    db = SessionLocal()
+    try:
+        drive_ids = [key[1] for key, _, _ in due]
+        changed = [
+            drive.id
+            for drive in db.query(Drive).filter(Drive.id.in_(drive_ids))
+            if apply_drive_status(drive, now)
+        ]
+        db.commit()
+        return changed
+    except Exception:
+        db.rollback()
+        for key, deadline, data in due:
+            drive_status_timers.schedule(key, deadline, **data)
+        raise
+    finally:
+        db.close()
+
+
+async def run_drive_lifecycle():
+    """Background task: persist drive status transitions at their boundary times, until cancelled"""
+    from app.utils.drive_events import drive_events
+    from app.utils.exam_cache import exam_cache
+
+    wakeup = asyncio.Event()
+    drive_status_timers.attach(asyncio.get_running_loop(), wakeup)
+
+    def load():
+        db = SessionLocal()
+        try:
+            return apply_all_drive_statuses(db)
+        finally:
+            db.close()
+
+    try:
+        changed = await run_in_threadpool(load)
+        logger.info(f"Drive lifecycle: updated {changed} drive statuses, {len(drive_status_timers)} transitions scheduled")
+    except Exception as e:
+        logger.error(f"Failed to load drive statuses: {str(e)}")
+
+    while True:
+        wakeup.clear()
+        failed = False
+        try:
+            changed = await run_in_threadpool(apply_due_transitions, datetime.utcnow())
+            for drive_id in changed:
+                exam_cache.invalidate(drive_id)
+                drive_events.notify(drive_id)
+        except Exception as e:
+            logger.error(f"Drive lifecycle update failed: {str(e)}")
+            failed = True
+
+        next_transition = drive_status_timers.next_deadline()
+        timeout = settings.exam_deadline_idle_seconds
+        if next_transition is not None and not failed:
+            timeout = max(0.05, min(timeout, (next_transition - datetime.utcnow()).total_seconds()))
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,113 @@
+"""
+Drive response serialization shared by the company and admin routes.
+
+A page of drives is serialized with a fixed number of queries regardless of
+its size: one for the targets of all drives, one each for the referenced
+colleges, student groups and companies. Question and student counts come
+from the drive's maintained counter columns.
+
+The company and admin routes keep their own output formats: the company one
+defaults a null category and exam duration, the admin one names missing
+colleges, groups and companies "Unknown ..." and returns the legacy fields as null.
+"""
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from app.models import College, Company, Drive, DriveTarget, StudentGroup
+
+
+def _names(db: Session, model, name_column, ids) -> Dict[int, str]:
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    return dict(db.query(model.id, name_column).filter(model.id.in_(ids)).all())
+
+
+def _target_name(custom_name: Optional[str], ref_id: Optional[int], names: Dict[int, str],
+                 admin: bool, unknown: str) -> Optional[str]:
+    # The admin format prefers the custom name, the company format the referenced row
+    if admin:
+        if custom_name:
+            return custom_name
+        return names.get(ref_id, unknown) if ref_id is not None else None
+    if ref_id is not None:
+        return names.get(ref_id)
+    return custom_name
+
+
+def serialize_drives(db: Session, drives: Iterable[Drive], with_counts: bool = False, admin: bool = False) -> List[dict]:
+    """
+    Format drives with resolved target names and company name (plus
+    question/student counts), in the admin routes' format if admin is set
+    """
+    drives = list(drives)
+    if not drives:
+        return []
+    drive_ids = [drive.id for drive in drives]
+
+    targets: Dict[int, List[DriveTarget]] = {}
+    for target in db.query(DriveTarget).filter(DriveTarget.drive_id.in_(drive_ids)).order_by(DriveTarget.id):
+        targets.setdefault(target.drive_id, []).append(target)
+
+    all_targets = [target for drive_targets in targets.values() for target in drive_targets]
+    colleges = _names(db, College, College.name, (t.college_id for t in all_targets))
+    groups = _names(db, StudentGroup, StudentGroup.name, (t.student_group_id for t in all_targets))
+    companies = _names(db, Company, Company.company_name, (drive.company_id for drive in drives))
+
+    result = []
+    for drive in drives:
+        drive_dict = {
+            "id": drive.id,
+            "company_id": drive.company_id,
+            "company_name": companies.get(drive.company_id, "Unknown Company" if admin else None),
+            "title": drive.title,
+            "description": drive.description,
+            "category": drive.category if admin else drive.category or "Technical MCQ",  # Default if null
+            "targets": [
+                {
+                    "id": target.id,
+                    "college_id": target.college_id,
+                    "custom_college_name": target.custom_college_name,
+                    "student_group_id": target.student_group_id,
+                    "custom_student_group_name": target.custom_student_group_name,
+                    "batch_year": target.batch_year,
+                    "college_name": _target_name(
+                        target.custom_college_name, target.college_id, colleges, admin, "Unknown College"
+                    ),
+                    "student_group_name": _target_name(
+                        target.custom_student_group_name, target.student_group_id, groups, admin, "Unknown Group"
+                    )
+                }
+                for target in targets.get(drive.id, [])
+            ],
+            "window_start": drive.window_start,  # May be null, but schema allows it
+            "window_end": drive.window_end,      # May be null, but schema allows it
+            "actual_window_start": drive.actual_window_start,
+            "actual_window_end": drive.actual_window_end,
+            "exam_duration_minutes": drive.exam_duration_minutes if admin else drive.exam_duration_minutes or 60,  # Default if null
+            "duration_minutes": drive.duration_minutes,  # Window duration in minutes
+            "status": drive.status,
+            "is_approved": drive.is_approved,
+            "admin_notes": drive.admin_notes,
+            "created_at": drive.created_at,
+            "updated_at": drive.updated_at
+        }
+        if admin:
+            # Legacy fields (kept in DB but not used)
+            drive_dict.update({
+                "question_type": None,
+                "duration_minutes": None,
+                "scheduled_start": None,
+                "actual_start": None,
+                "actual_end": None
+            })
+        if with_counts:
+            drive_dict["question_count"] = drive.question_count
+            drive_dict["student_count"] = drive.student_count
+        result.append(drive_dict)
+
+    return result
+
+
+def serialize_drive(db: Session, drive: Drive, with_counts: bool = False, admin: bool = False) -> dict:
+    """Format a single drive (see serialize_drives)"""
+    return serialize_drives(db, [drive], with_counts, admin)[0]
@@ -0,0 +1,61 @@
+"""
+Conditional GET helpers: entity tags, If-None-Match matching and 304 responses.
+
+ETags are strong validators derived from the representation (or from the
+version of the data it was built from), so every worker produces the same tag
+for the same content.
+"""
+import hashlib
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+
+# Clients may keep the response but must revalidate it before each reuse
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Quoted strong ETag from the body bytes or the parts identifying a version"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str, cache_control: str = REVALIDATE) -> Optional[Response]:
+    """A 304 response if the client already has this version, else None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def set_validators(response: Response, etag: str, cache_control: str = REVALIDATE):
+    """Add the validator headers to an endpoint's response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def json_response(body: bytes, etag: str, cache_control: str = REVALIDATE) -> Response:
+    """Pre-encoded JSON body with its validator"""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
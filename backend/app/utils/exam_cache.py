@@ -0,0 +1,183 @@
+import threading
+import orjson
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models import Drive, Question
+from app.schemas.student import ExamQuestion
+from app.utils.answer_key import AnswerKey
+
+# Naive datetimes in the database represent UTC; emit them as ISO strings with a 'Z' suffix
+JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+class CachedExam:
+    """Answer-free snapshot of a drive and its question set for the student exam path"""
+
+    def __init__(self, drive: Drive, questions: List[Question]):
+        self.drive_id = drive.id
+        self.drive_title = drive.title
+        self.drive_description = drive.description
+        self.exam_duration_minutes = drive.exam_duration_minutes
+        self.window_start = drive.window_start
+        self.window_end = drive.window_end
+        self.actual_window_start = drive.actual_window_start
+        self.actual_window_end = drive.actual_window_end
+        self.is_approved = drive.is_approved
+        self.status = drive.status
+        # Drive row version the snapshot was taken at (updated_at changes on every drive update)
+        self.version = drive.updated_at
+
+        # Question id -> pre-built exam question (correct_answer is never copied)
+        self.questions: Dict[int, ExamQuestion] = {
+            q.id: ExamQuestion(
+                id=q.id,
+                question_text=q.question_text,
+                option_a=q.option_a,
+                option_b=q.option_b,
+                option_c=q.option_c,
+                option_d=q.option_d,
+                marks=q.points
+            )
+            for q in questions
+        }
+        self.question_ids: List[int] = sorted(self.questions)
+        self.total_marks = sum(q.marks for q in self.questions.values())
+
+        # Question id -> pre-encoded JSON object, spliced into responses as-is
+        self.question_fragments: Dict[int, bytes] = {
+            qid: orjson.dumps(q.model_dump()) for qid, q in self.questions.items()
+        }
+
+    def render(
+        self,
+        question_order: List[int],
+        exam_started_at: Optional[datetime],
+        expected_end: Optional[datetime]
+    ) -> bytes:
+        """
+        Build the ExamDataResponse JSON body for one student.
+
+        Only the per-student scalars are encoded per request; the questions are
+        joined from the pre-encoded fragments in the student's order.
+        """
+        ordered_ids = [qid for qid in question_order if qid in self.question_fragments]
+
+        head = orjson.dumps({
+            "drive_id": self.drive_id,
+            "drive_title": self.drive_title,
+            "drive_description": self.drive_description,
+            "duration_minutes": self.exam_duration_minutes,
+            "scheduled_start": self.window_start,
+            "actual_start": self.actual_window_start,
+            "actual_end": self.actual_window_end,
+            "expected_end": expected_end,
+            "question_count": len(ordered_ids),
+            "total_marks": sum(self.questions[qid].marks for qid in ordered_ids),
+            "student_question_order": question_order,
+            "exam_started_at": exam_started_at
+        }, option=JSON_OPTIONS)
+
+        return b"".join([
+            head[:-1],
+            b',"questions":[',
+            b",".join(self.question_fragments[qid] for qid in ordered_ids),
+            b"]}"
+        ])
+
+
+class ExamCache:
+    """
+    Per-process cache of exam payloads keyed by drive_id.
+
+    Only approved drives are cached: their question set can no longer change
+    (question uploads are refused once a drive is approved). The drive row
+    itself can (start/end, suspend, reactivate, status edits, a regrade), so
+    every use checks the entry against the row's updated_at - one primary-key
+    lookup - and reloads it if the drive was updated by any worker.
+    invalidate() drops an entry on this worker right away.
+
+    Compiled answer keys for grading live next to the payloads (never inside
+    them), are checked the same way and are invalidated together with them.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, CachedExam] = {}
+        self._answer_keys: Dict[int, Tuple[Optional[datetime], AnswerKey]] = {}  # drive_id -> (version, key)
+        # Bumped on every invalidation so a load that raced with it is not stored
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, drive_id: int, version: Optional[datetime] = None) -> Optional[CachedExam]:
+        """
+        Return the cached exam for a drive, loading it from the database on a
+        miss or if the drive changed. Pass version (the drive's updated_at) if
+        the caller has just read the drive row, to skip the version lookup.
+        """
+        entry = self._entries.get(drive_id)
+        if entry is not None:
+            if version is None:
+                version = db.query(Drive.updated_at).filter(Drive.id == drive_id).scalar()
+            if entry.version == version:
+                return entry
+
+        with self._lock:
+            generation = self._generations.get(drive_id, 0)
+
+        drive = db.query(Drive).filter(Drive.id == drive_id).first()
+        if not drive:
+            return None
+
+        questions = db.query(Question).filter(Question.drive_id == drive_id).all()
+        entry = CachedExam(drive, questions)
+
+        if drive.is_approved:
+            with self._lock:
+                if self._generations.get(drive_id, 0) == generation:
+                    self._entries[drive_id] = entry
+
+        return entry
+
+    def get_answer_key(self, db: Session, drive_id: int) -> Optional[AnswerKey]:
+        """Return the compiled answer key for a drive, building it on a miss or if the drive changed"""
+        with self._lock:
+            generation = self._generations.get(drive_id, 0)
+
+        drive = db.query(Drive.is_approved, Drive.updated_at).filter(Drive.id == drive_id).first()
+        if drive is None:
+            return None
+
+        cached = self._answer_keys.get(drive_id)
+        if cached is not None and cached[0] == drive.updated_at:
+            return cached[1]
+
+        answer_key = AnswerKey(db.query(Question).filter(Question.drive_id == drive_id).all())
+
+        if drive.is_approved:
+            with self._lock:
+                if self._generations.get(drive_id, 0) == generation:
+                    self._answer_keys[drive_id] = (drive.updated_at, answer_key)
+
+        return answer_key
+
+    def warm(self, db: Session, drive_id: int):
+        """Build and cache a drive's exam payload and answer key ahead of the first request"""
+        self.get(db, drive_id)
+        self.get_answer_key(db, drive_id)
+
+    def invalidate(self, drive_id: int):
+        """Drop a drive's cached exam and answer key"""
+        with self._lock:
+            self._generations[drive_id] = self._generations.get(drive_id, 0) + 1
+            self._entries.pop(drive_id, None)
+            self._answer_keys.pop(drive_id, None)
+
+    def clear(self):
+        """Drop every cached exam and answer key"""
+        with self._lock:
+            for drive_id in set(self._entries) | set(self._answer_keys):
+                self._generations[drive_id] = self._generations.get(drive_id, 0) + 1
+            self._entries.clear()
+            self._answer_keys.clear()
+
+
+exam_cache = ExamCache()
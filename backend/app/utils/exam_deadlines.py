@@ -0,0 +1,262 @@
+"""
+Server-side enforcement of exam deadlines.
+
+Every started exam has a deadline (exam_started_at + exam_duration_minutes)
+and every manually started drive closes at actual_window_end. The scheduler
+keeps both in one min-heap and auto-submits expired sessions in batches, so
+overdue exams are found by popping the heap instead of scanning students.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database.config import settings
+from app.database.connection import SessionLocal
+from app.models import Drive, Student
+from app.utils.student_auth_cache import student_auth_cache
+
+logger = logging.getLogger(__name__)
+
+STUDENT = "student"
+DRIVE = "drive"
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (deadline, key) with lazy cancellation.
+
+    Rescheduling or cancelling a key only updates the key's current entry;
+    superseded heap items are skipped when they surface. Safe to call from
+    sync route handlers running in worker threads.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, tuple]] = []
+        self._current: Dict[tuple, Tuple[datetime, int, dict]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop, wakeup: asyncio.Event):
+        self._loop = loop
+        self._wakeup = wakeup
+
+    def schedule(self, key: tuple, deadline: datetime, **data):
+        """Set (or move) the deadline of a key"""
+        with self._lock:
+            sequence = next(self._counter)
+            self._current[key] = (deadline, sequence, data)
+            heapq.heappush(self._heap, (deadline, sequence, key))
+            is_earliest = self._heap[0][1] == sequence
+
+        # Wake the runner if this deadline is now the earliest one
+        if is_earliest and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def cancel(self, key: tuple):
+        with self._lock:
+            self._current.pop(key, None)
+
+    def next_deadline(self) -> Optional[datetime]:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int) -> List[Tuple[tuple, datetime, dict]]:
+        """Remove and return up to limit entries whose deadline is at or before now"""
+        due = []
+        with self._lock:
+            while self._heap and len(due) < limit:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                deadline, sequence, key = heapq.heappop(self._heap)
+                _, _, data = self._current.pop(key)
+                due.append((key, deadline, data))
+        return due
+
+    def __len__(self):
+        return len(self._current)
+
+    def _drop_stale(self):
+        while self._heap:
+            deadline, sequence, key = self._heap[0]
+            current = self._current.get(key)
+            if current is not None and current[1] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+
+exam_deadlines = DeadlineScheduler()
+
+
+def schedule_student_deadline(student_id: int, drive_id: int, exam_started_at: datetime, duration_minutes: int):
+    """Track a started exam; it is auto-submitted once its duration (plus grace) has passed"""
+    deadline = exam_started_at + timedelta(minutes=duration_minutes)
+    exam_deadlines.schedule(
+        (STUDENT, student_id), deadline,
+        drive_id=drive_id, exam_started_at=exam_started_at
+    )
+
+
+def schedule_drive_window_end(drive_id: int, actual_window_end: datetime):
+    """Track a started drive; its in-progress exams are auto-submitted when the window closes"""
+    exam_deadlines.schedule((DRIVE, drive_id), actual_window_end, actual_window_end=actual_window_end)
+
+
+def cancel_student_deadline(student_id: int):
+    exam_deadlines.cancel((STUDENT, student_id))
+
+
+def cancel_drive_window_end(drive_id: int):
+    exam_deadlines.cancel((DRIVE, drive_id))
+
+
+def load_active_deadlines(db: Session) -> int:
+    """Schedule every exam and drive window that is currently open (used at startup)"""
+    count = 0
+    in_progress = db.query(Student.id, Student.drive_id, Student.exam_started_at, Drive.exam_duration_minutes).join(
+        Drive, Drive.id == Student.drive_id
+    ).filter(
+        Student.exam_started_at.isnot(None),
+        Student.exam_submitted_at.is_(None),
+        Drive.exam_duration_minutes.isnot(None)
+    )
+    for row in in_progress:
+        schedule_student_deadline(row.id, row.drive_id, row.exam_started_at, row.exam_duration_minutes)
+        count += 1
+
+    open_drives = db.query(Drive.id, Drive.actual_window_end).filter(
+        Drive.actual_window_start.isnot(None),
+        Drive.actual_window_end.isnot(None),
+        Drive.status != "suspended"
+    )
+    for row in open_drives:
+        schedule_drive_window_end(row.id, row.actual_window_end)
+        count += 1
+
+    return count
+
+
+def expire_due(db: Session, due: List[Tuple[tuple, datetime, dict]]) -> int:
+    """Auto-submit the exams of expired entries; returns the number of students submitted"""
+    student_rows = [
+        {"student_id": key[1], "started": data["exam_started_at"], "submitted": deadline}
+        for key, deadline, data in due if key[0] == STUDENT
+    ]
+    affected_drives = {data["drive_id"] for key, _, data in due if key[0] == STUDENT}
+    submitted = 0
+
+    if student_rows:
+        # Only exams still in the attempt that was scheduled are submitted
+        # (a suspended and restarted drive resets exam_started_at)
+        students = Student.__table__
+        result = db.connection().execute(
+            update(students)
+            .where(
+                students.c.id == bindparam("student_id"),
+                students.c.exam_started_at == bindparam("started"),
+                students.c.exam_submitted_at.is_(None)
+            )
+            .values(exam_submitted_at=bindparam("submitted")),
+            student_rows
+        )
+        submitted += max(result.rowcount, 0)
+
+    for key, deadline, data in due:
+        if key[0] != DRIVE:
+            continue
+        drive_id = key[1]
+        # Skip if the window was moved or reset since this entry was scheduled
+        current_end = db.query(Drive.actual_window_end).filter(Drive.id == drive_id).scalar()
+        if current_end != data["actual_window_end"]:
+            continue
+        result = db.execute(
+            update(Student)
+            .where(
+                Student.drive_id == drive_id,
+                Student.exam_started_at.isnot(None),
+                Student.exam_submitted_at.is_(None)
+            )
+            .values(exam_submitted_at=deadline)
+            .execution_options(synchronize_session=False)
+        )
+        submitted += result.rowcount
+        affected_drives.add(drive_id)
+
+    db.commit()
+
+    for drive_id in affected_drives:
+        student_auth_cache.invalidate_drive(drive_id)
+
+    return submitted
+
+
+def expire_due_deadlines(now: datetime) -> Tuple[int, int]:
+    """Pop and process one batch of due deadlines using a fresh session; returns (entries, students submitted)"""
+    grace = timedelta(seconds=settings.exam_auto_submit_grace_seconds)
+    due = exam_deadlines.pop_due(now - grace, settings.exam_auto_submit_batch_size)
+    if not due:
+        return 0, 0
+
+    db = SessionLocal()
+    try:
+        return len(due), expire_due(db, due)
+    except Exception:
+        db.rollback()
+        # Put the batch back so it is retried
+        for key, deadline, data in due:
+            exam_deadlines.schedule(key, deadline, **data)
+        raise
+    finally:
+        db.close()
+
+
+async def run_deadline_scheduler():
+    """Background task: auto-submit exams as their deadlines pass, until cancelled"""
+    wakeup = asyncio.Event()
+    exam_deadlines.attach(asyncio.get_running_loop(), wakeup)
+
+    def load():
+        db = SessionLocal()
+        try:
+            return load_active_deadlines(db)
+        finally:
+            db.close()
+
+    try:
+        loaded = await run_in_threadpool(load)
+        logger.info(f"Exam deadline scheduler tracking {loaded} open exams and windows")
+    except Exception as e:
+        logger.error(f"Failed to load open exam deadlines: {str(e)}")
+
+    grace = settings.exam_auto_submit_grace_seconds
+    while True:
+        wakeup.clear()
+        failed = False
+        try:
+            processed, submitted = await run_in_threadpool(expire_due_deadlines, datetime.utcnow())
+            if submitted:
+                logger.info(f"Auto-submitted {submitted} expired exams")
+            if processed == settings.exam_auto_submit_batch_size:
+                continue  # There may be more due entries than one batch
+        except Exception as e:
+            logger.error(f"Exam deadline scheduler failed: {str(e)}")
+            failed = True
+
+        next_deadline = exam_deadlines.next_deadline()
+        timeout = settings.exam_deadline_idle_seconds
+        if next_deadline is not None and not failed:
+            seconds_until_due = (next_deadline - datetime.utcnow()).total_seconds() + grace
+            timeout = max(0.5, min(timeout, seconds_until_due))
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,60 @@
+import random
+from sqlalchemy import BigInteger, cast, update
+from sqlalchemy.orm import Session
+from app.database.config import settings
+from app.models.student import Student
+from app.utils.question_order import MAX_SEED, generate_seed
+from app.utils.violation_buffer import empty_violations
+
+# Odd multiplier for the set-based seed assignment; coprime with MAX_SEED (a prime),
+# so distinct student ids always get distinct seeds
+SEED_MULTIPLIER = 1103515245
+
+
+def materialize_exam_state(db: Session, drive_id: int, question_ids=None) -> int:
+    """
+    Pre-generate the per-student exam state of every student of a drive that
+    has not started yet: question order (seed or list, per QUESTION_ORDER_MODE)
+    and zeroed violation counters.
+
+    In seed mode this is a single set-based UPDATE; the seed is derived from
+    the student id and a random per-call salt. List mode needs a shuffled list
+    per student, which is written with one executemany UPDATE. The student
+    start endpoint then only has to stamp exam_started_at.
+
+    Does not commit; returns the number of students prepared.
+    """
+    not_started = (
+        Student.drive_id == drive_id,
+        Student.exam_started_at.is_(None),
+        Student.exam_submitted_at.is_(None)
+    )
+
+    if settings.question_order_mode == "list":
+        student_ids = [row.id for row in db.query(Student.id).filter(*not_started)]
+        rows = []
+        for student_id in student_ids:
+            question_order = list(question_ids or [])
+            random.shuffle(question_order)
+            rows.append({
+                "id": student_id,
+                "question_order": question_order,
+                "violation_details": empty_violations(),
+                "total_violations": 0
+            })
+        if rows:
+            db.execute(update(Student), rows)
+        return len(rows)
+
+    salt = generate_seed()
+    result = db.execute(
+        update(Student)
+        .where(*not_started)
+        .values(
+            question_seed=(cast(Student.id, BigInteger) * SEED_MULTIPLIER + salt) % MAX_SEED + 1,
+            violation_details=empty_violations(),
+            total_violations=0
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
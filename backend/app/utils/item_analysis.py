@@ -0,0 +1,160 @@
+"""
+Item analysis of a drive's questions: attempt rate, difficulty (p-value),
+option (distractor) distribution and point-biserial discrimination.
+
+Responses are reduced in one aggregated query to a row per (question, option)
+holding the number of examinees who chose it and the sum of their scores.
+Every statistic follows from those sums plus the overall score mean and
+variance, so the work in Python is proportional to the number of questions,
+not the number of responses.
+
+Examinees are students who submitted and were not disqualified. A question
+an examinee did not answer counts as incorrect. Discrimination uses the
+uncorrected total score (the item's own points included).
+"""
+import math
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import Session
+from app.models import Question, Student, StudentResponse
+from app.utils.answer_key import OPTION_LETTERS, accepted_options_mask
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def point_biserial(selected: int, selected_score_sum: float, examinees: int, mean: float, std_dev: float) -> Optional[float]:
+    """
+    Correlation between choosing an answer (0/1) and the total score:
+    r = (M1 - M) / s * sqrt(p / (1 - p)), where M1 is the mean score of those
+    who chose it. Undefined when everyone or no one chose it, or all scores are equal.
+    """
+    if not examinees or not std_dev or selected in (0, examinees):
+        return None
+    p = selected / examinees
+    selected_mean = selected_score_sum / selected
+    return round((selected_mean - mean) / std_dev * math.sqrt(p / (1 - p)), 4)
+
+
+def analyze_questions(db: Session, drive_id: int) -> dict:
+    """Compute the item analysis of every question of a drive"""
+    questions = db.query(Question).filter(Question.drive_id == drive_id).order_by(Question.id).all()
+
+    examinee_filter = (
+        Student.drive_id == drive_id,
+        Student.exam_submitted_at.isnot(None),
+        Student.is_disqualified == False
+    )
+    score = func.coalesce(Student.score, 0)
+    examinees, score_sum, score_square_sum = db.query(
+        func.count(Student.id),
+        func.coalesce(func.sum(cast(score, Float)), 0.0),
+        func.coalesce(func.sum(cast(score, Float) * score), 0.0)
+    ).filter(*examinee_filter).one()
+
+    mean = score_sum / examinees if examinees else 0.0
+    variance = max(score_square_sum / examinees - mean * mean, 0.0) if examinees else 0.0
+    std_dev = math.sqrt(variance)
+
+    # One pass over the responses: (question, option) -> examinees and their score sum
+    option = func.upper(StudentResponse.selected_option)
+    aggregates = db.query(
+        StudentResponse.question_id,
+        option,
+        func.count(StudentResponse.id),
+        func.coalesce(func.sum(cast(score, Float)), 0.0)
+    ).join(
+        Student, Student.id == StudentResponse.student_id
+    ).filter(
+        StudentResponse.drive_id == drive_id,
+        StudentResponse.selected_option.isnot(None),
+        *examinee_filter
+    ).group_by(StudentResponse.question_id, option).all()
+
+    chosen: Dict[int, Dict[str, tuple]] = {}
+    for question_id, letter, count, selected_score_sum in aggregates:
+        chosen.setdefault(question_id, {})[letter] = (count, selected_score_sum)
+
+    results = []
+    for number, question in enumerate(questions, start=1):
+        accepted = accepted_options_mask(question)
+        by_option = chosen.get(question.id, {})
+
+        attempted = sum(count for count, _ in by_option.values())
+        correct = correct_score_sum = 0
+        options = {}
+        for index, letter in enumerate(OPTION_LETTERS):
+            count, selected_score_sum = by_option.get(letter, (0, 0.0))
+            is_correct = bool(accepted & (1 << index))
+            if is_correct:
+                correct += count
+                correct_score_sum += selected_score_sum
+            options[letter] = {
+                "text": getattr(question, f"option_{letter.lower()}"),
+                "is_correct": is_correct,
+                "count": count,
+                "fraction": _ratio(count, examinees),
+                "mean_score": round(selected_score_sum / count, 2) if count else None,
+                # Negative for a working distractor: it attracts the weaker examinees
+                "point_biserial": point_biserial(count, selected_score_sum, examinees, mean, std_dev)
+            }
+
+        results.append({
+            "question_id": question.id,
+            "number": number,
+            "question_text": question.question_text,
+            "points": question.points,
+            "correct_options": [letter for index, letter in enumerate(OPTION_LETTERS) if accepted & (1 << index)],
+            "attempted": attempted,
+            "attempt_rate": _ratio(attempted, examinees),
+            "correct": correct,
+            "p_value": _ratio(correct, examinees),
+            "discrimination": point_biserial(correct, correct_score_sum, examinees, mean, std_dev),
+            "omitted": examinees - attempted,
+            "options": options
+        })
+
+    return {
+        "drive_id": drive_id,
+        "examinees": examinees,
+        "mean_score": round(mean, 2),
+        "score_std_dev": round(std_dev, 2),
+        "generated_at": datetime.utcnow(),
+        "questions": results
+    }
+
+
+class ItemAnalysisCache:
+    """
+    Per-process cache of item analyses of completed drives.
+
+    Once a drive is completed its responses no longer change; only a regrade
+    can change correctness and scores. Each analysis is stored with the version
+    it was computed from (the drive's updated_at, which a regrade bumps, and
+    its results fingerprint), and get() only returns it while that still
+    matches, so a regrade on another worker is seen as well.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[tuple, dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, drive_id: int, version: tuple) -> Optional[dict]:
+        entry = self._entries.get(drive_id)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def put(self, drive_id: int, version: tuple, analysis: dict):
+        with self._lock:
+            self._entries[drive_id] = (version, analysis)
+
+    def invalidate(self, drive_id: int):
+        with self._lock:
+            self._entries.pop(drive_id, None)
+
+
+item_analysis_cache = ItemAnalysisCache()
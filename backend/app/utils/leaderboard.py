@@ -0,0 +1,218 @@
+"""
+Per-drive leaderboards: rank, percentile and top-k of submitted scores.
+
+Scores are small non-negative integers (at most the drive's total marks), so
+a drive's ranking is a Fenwick tree of student counts indexed by score plus a
+bucket of student ids per score. Adding or removing a student and counting
+the students above a score are O(log max_score); the k-th best score is found
+by a binary descent of the same tree.
+
+Boards live in process memory. Each worker updates its own boards as its
+submissions are committed and builds a board from the students table on
+first use (or after invalidate(), e.g. a regrade or a suspended drive). While
+a drive is still running, submissions handled by other workers are picked up
+by rebuilding its board every LEADERBOARD_REFRESH_SECONDS. A board built after
+the results became final is kept with the drive's results fingerprint and
+rebuilt only when that changes, so a regrade on another worker is seen too.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.database.config import settings
+from app.models.student import Student
+from app.utils.response_versions import results_fingerprint
+
+
+class ScoreIndex:
+    """Order-statistics index of integer scores with per-score student buckets"""
+
+    def __init__(self, max_score: int = 0):
+        self._size = max(max_score, 0) + 1
+        self._tree = [0] * (self._size + 1)  # 1-based Fenwick tree over score + 1
+        self._buckets: Dict[int, Set[int]] = {}
+        self.scores: Dict[int, int] = {}  # student id -> score
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def _update(self, score: int, delta: int):
+        i = score + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_at_most(self, score: int) -> int:
+        i = min(score, self._size - 1) + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _grow(self, max_score: int):
+        # Rebuild for a larger score range (only if a score exceeds the expected maximum)
+        counts = {score: len(ids) for score, ids in self._buckets.items()}
+        self._size = max_score + 1
+        self._tree = [0] * (self._size + 1)
+        for score, count in counts.items():
+            self._update(score, count)
+
+    def add(self, student_id: int, score: int):
+        """Insert a student, or move them if they are already ranked"""
+        score = max(score, 0)
+        if student_id in self.scores:
+            if self.scores[student_id] == score:
+                return
+            self.remove(student_id)
+        if score >= self._size:
+            self._grow(max(score, self._size * 2))
+        self.scores[student_id] = score
+        self._buckets.setdefault(score, set()).add(student_id)
+        self._update(score, 1)
+
+    def remove(self, student_id: int):
+        score = self.scores.pop(student_id, None)
+        if score is None:
+            return
+        bucket = self._buckets[score]
+        bucket.discard(student_id)
+        if not bucket:
+            del self._buckets[score]
+        self._update(score, -1)
+
+    def rank(self, score: int) -> int:
+        """Competition rank of a score: 1 + the number of students scoring strictly higher"""
+        return len(self.scores) - self._count_at_most(score) + 1
+
+    def percentile(self, score: int) -> float:
+        """Percentile rank: share of students below the score, counting ties as half"""
+        n = len(self.scores)
+        if not n:
+            return 0.0
+        below = self._count_at_most(score - 1) if score > 0 else 0
+        equal = len(self._buckets.get(score, ()))
+        return round((below + equal / 2) / n * 100, 2)
+
+    def kth_best_score(self, k: int) -> Optional[int]:
+        """Score of the k-th best student (1-based), by binary descent of the tree"""
+        n = len(self.scores)
+        if k < 1 or k > n:
+            return None
+        # Find the smallest score with count_at_most(score) >= n - k + 1
+        target = n - k + 1
+        position = 0
+        step = 1 << (self._size.bit_length())
+        while step:
+            next_position = position + step
+            if next_position <= self._size and self._tree[next_position] < target:
+                position = next_position
+                target -= self._tree[next_position]
+            step >>= 1
+        return position  # position is 1-based index - 1 == score
+
+    def top(self, k: int) -> List[Tuple[int, int, int]]:
+        """Best k students as (rank, student_id, score); ties at the cut-off are all included"""
+        if k < 1 or not self.scores:
+            return []
+        cutoff = self.kth_best_score(min(k, len(self.scores)))
+        entries = []
+        for score in sorted((s for s in self._buckets if s >= cutoff), reverse=True):
+            rank = self.rank(score)
+            entries.extend((rank, student_id, score) for student_id in sorted(self._buckets[score]))
+        return entries
+
+
+class _Board:
+    __slots__ = ("index", "built_at", "fingerprint")
+
+    def __init__(self, index: ScoreIndex, fingerprint: Optional[tuple]):
+        self.index = index
+        self.built_at = time.monotonic()
+        # results_fingerprint() of a board built after the results became final, else None
+        self.fingerprint = fingerprint
+
+
+def build_index(db: Session, drive_id: int) -> ScoreIndex:
+    """Rank every submitted, scored and not disqualified student of a drive"""
+    rows = db.query(Student.id, Student.score, Student.total_marks).filter(
+        Student.drive_id == drive_id,
+        Student.exam_submitted_at.isnot(None),
+        Student.is_disqualified == False,
+        Student.score.isnot(None)
+    ).all()
+
+    index = ScoreIndex(max((row.total_marks or 0 for row in rows), default=0))
+    for row in rows:
+        index.add(row.id, row.score)
+    return index
+
+
+class LeaderboardRegistry:
+    """Leaderboards of the drives this worker has been asked about, kept current by record()"""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._boards: Dict[int, _Board] = {}
+        # Bumped on every invalidation so a build that raced with it is not stored
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _board(self, db: Session, drive_id: int, final: bool) -> _Board:
+        # Built from the database if missing, if a final board's results have changed
+        # since, or if stale and built before the results were final
+        board = self._boards.get(drive_id)
+        fingerprint = results_fingerprint(db, drive_id) if final else None
+        if board is not None:
+            if board.fingerprint is not None:
+                if board.fingerprint == fingerprint:
+                    return board
+            elif time.monotonic() - board.built_at < self.refresh_seconds:
+                return board
+
+        with self._lock:
+            generation = self._generations.get(drive_id, 0)
+
+        # The fingerprint is read before the build, so a change in between only costs a rebuild
+        board = _Board(build_index(db, drive_id), fingerprint)
+
+        with self._lock:
+            if self._generations.get(drive_id, 0) == generation:
+                self._boards[drive_id] = board
+        return board
+
+    def top(self, db: Session, drive_id: int, k: int, final: bool = False) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """(number of ranked students, best k as (rank, student_id, score))"""
+        board = self._board(db, drive_id, final)
+        with self._lock:
+            return len(board.index), board.index.top(k)
+
+    def standing(self, db: Session, drive_id: int, student_id: int, final: bool = False) -> Optional[dict]:
+        """Rank and percentile of one student, or None if they are not ranked"""
+        board = self._board(db, drive_id, final)
+        with self._lock:
+            score = board.index.scores.get(student_id)
+            if score is None:
+                return None
+            return {
+                "score": score,
+                "rank": board.index.rank(score),
+                "percentile": board.index.percentile(score),
+                "ranked_students": len(board.index)
+            }
+
+    def record(self, drive_id: int, student_id: int, score: int):
+        """Add a committed submission to the drive's board (if this worker has one)"""
+        with self._lock:
+            board = self._boards.get(drive_id)
+            if board is not None:
+                board.index.add(student_id, score)
+
+    def invalidate(self, drive_id: int):
+        """Drop a drive's board; the next query rebuilds it from the students table"""
+        with self._lock:
+            self._boards.pop(drive_id, None)
+            self._generations[drive_id] = self._generations.get(drive_id, 0) + 1
+
+
+leaderboards = LeaderboardRegistry(refresh_seconds=settings.leaderboard_refresh_seconds)
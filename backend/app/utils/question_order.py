@@ -0,0 +1,65 @@
+import random
+import secrets
+from typing import Iterable, List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.student import Student
+
+# Seeds are stored in a plain INTEGER column
+MAX_SEED = 2**31 - 1
+
+
+def generate_seed() -> int:
+    """Generate a random per-student question order seed"""
+    return secrets.randbelow(MAX_SEED) + 1
+
+
+def derive_question_order(seed: int, question_ids: Iterable[int]) -> List[int]:
+    """
+    Derive a student's question order from their seed and the drive's question ids.
+
+    The ids are sorted before shuffling so the result depends only on
+    (seed, question set), never on the order rows came back from the database.
+    """
+    order = sorted(question_ids)
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def resolve_question_order(student: Student, question_ids: Iterable[int]) -> Optional[List[int]]:
+    """
+    Return the order the student sees their questions in.
+
+    A stored question_order list always wins (rows written before seeds existed,
+    or with QUESTION_ORDER_MODE=list); otherwise the order is derived from the seed.
+    """
+    if student.question_order:
+        return student.question_order
+    if student.question_seed is not None:
+        return derive_question_order(student.question_seed, question_ids)
+    return None
+
+
+def backfill_question_seeds(db: Session) -> int:
+    """
+    Give a seed to every student that has not started their exam yet.
+
+    Students that already started keep their stored question_order: an arbitrary
+    shuffled list cannot be reproduced from a seed, and in-progress exams and
+    detailed exports depend on the exact order that was shown.
+    """
+    student_ids = [
+        row.id for row in db.query(Student.id).filter(
+            Student.question_seed.is_(None),
+            Student.exam_started_at.is_(None)
+        )
+    ]
+
+    if student_ids:
+        db.execute(
+            update(Student),
+            [{"id": student_id, "question_seed": generate_seed()} for student_id in student_ids]
+        )
+        db.commit()
+
+    return len(student_ids)
@@ -0,0 +1,74 @@
+"""
+Per-process cache of the college and student group lists.
+
+Each list (approved only for companies, all rows for admins) is kept as its
+pre-encoded JSON body plus an ETag of that body, so a repeat fetch is either a
+304 or a copy of cached bytes, with no query. Every endpoint that creates,
+edits, approves or deletes a college or student group calls invalidate() after
+its commit. The cache is per process, so with several workers
+REFERENCE_CACHE_TTL_SECONDS bounds how long another worker serves an old list.
+"""
+import threading
+import time
+from typing import Dict, Tuple
+import orjson
+from sqlalchemy.orm import Session
+from app.database.config import settings
+from app.models import College, StudentGroup
+from app.utils.etag import make_etag
+from app.utils.exam_cache import JSON_OPTIONS
+
+REFERENCE_MODELS = {
+    "colleges": College,
+    "student_groups": StudentGroup,
+}
+
+
+def encode_reference_rows(db: Session, model, approved_only: bool) -> bytes:
+    """JSON body of CollegeResponse / StudentGroupResponse items, in id order"""
+    query = db.query(model.id, model.name, model.is_approved, model.created_at)
+    if approved_only:
+        query = query.filter(model.is_approved == True)
+    rows = [
+        {"id": row.id, "name": row.name, "is_approved": row.is_approved, "created_at": row.created_at}
+        for row in query.order_by(model.id)
+    ]
+    return orjson.dumps(rows, option=JSON_OPTIONS)
+
+
+class ReferenceDataCache:
+    """(kind, approved_only) -> (expires_at, JSON body, ETag)"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, bool], tuple] = {}
+        # Bumped on every invalidation so a load that raced with it is not stored
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, kind: str, approved_only: bool) -> Tuple[bytes, str]:
+        """(body, etag) of a reference list, loaded from the database if missing or expired"""
+        key = (kind, approved_only)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1], entry[2]
+
+        with self._lock:
+            version = self._version
+
+        body = encode_reference_rows(db, REFERENCE_MODELS[kind], approved_only)
+        etag = make_etag(body)
+
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, body, etag)
+        return body, etag
+
+    def invalidate(self):
+        """Drop every cached list; the next fetch of each reloads it"""
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+
+reference_cache = ReferenceDataCache(ttl_seconds=settings.reference_cache_ttl_seconds)
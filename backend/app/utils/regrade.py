@@ -0,0 +1,119 @@
+"""
+Offline regrade of a whole drive against its current questions.
+
+Used when a company fixes a wrong correct_answer after students have
+submitted: StudentResponse.is_correct and Student.score are recomputed for
+the entire drive in a few set-based statements instead of re-running the
+per-student submit logic.
+"""
+from array import array
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models import Drive, Question, Student, StudentResponse
+from app.utils.answer_key import AnswerKey, OPTION_BITS
+from app.utils.exam_cache import exam_cache
+from app.utils.item_analysis import item_analysis_cache
+from app.utils.leaderboard import leaderboards
+
+# Max ids per "WHERE id IN (...)" statement
+UPDATE_CHUNK_SIZE = 5000
+
+
+def _chunks(ids: List[int], size: int = UPDATE_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def regrade_drive(db: Session, drive_id: int) -> Dict[str, int]:
+    """
+    Regrade every submitted response of a drive and rewrite the scores.
+
+    Disqualified students keep their zero score, and students without a score
+    or any response keep no score. Returns counts of what was looked at and
+    what changed.
+    """
+    answer_key = AnswerKey(db.query(Question).filter(Question.drive_id == drive_id).all())
+
+    # Load the drive's responses as columns
+    rows = db.execute(
+        select(
+            StudentResponse.id,
+            StudentResponse.student_id,
+            StudentResponse.question_id,
+            StudentResponse.selected_option,
+            StudentResponse.is_correct
+        ).where(StudentResponse.drive_id == drive_id)
+    ).all()
+    if rows:
+        response_ids, student_ids, question_ids, selected_options, stored_correct = zip(*rows)
+    else:
+        response_ids = student_ids = question_ids = selected_options = stored_correct = ()
+
+    # Grade all responses column-wise against the answer key
+    positions = [answer_key.positions.get(question_id, -1) for question_id in question_ids]
+    selected_bits = array("B", (OPTION_BITS.get(option, 0) for option in selected_options))
+    correct = [
+        position >= 0 and bool(answer_key.accepted[position] & bits)
+        for position, bits in zip(positions, selected_bits)
+    ]
+
+    # Only responses whose grade changed are written back
+    now_correct = [rid for rid, old, new in zip(response_ids, stored_correct, correct) if new and old is not True]
+    now_wrong = [rid for rid, old, new in zip(response_ids, stored_correct, correct) if not new and old is not False]
+    for ids, is_correct in ((now_correct, True), (now_wrong, False)):
+        for chunk in _chunks(ids):
+            db.execute(
+                update(StudentResponse)
+                .where(StudentResponse.id.in_(chunk))
+                .values(is_correct=is_correct)
+                .execution_options(synchronize_session=False)
+            )
+
+    # Per-student score totals
+    scores: Dict[int, int] = {}
+    for student_id, position, is_correct in zip(student_ids, positions, correct):
+        if is_correct:
+            scores[student_id] = scores.get(student_id, 0) + answer_key.points[position]
+
+    students = db.query(Student.id, Student.score, Student.total_marks).filter(
+        Student.drive_id == drive_id,
+        Student.exam_submitted_at.isnot(None),
+        Student.is_disqualified == False
+    ).all()
+
+    # A student whose exam ended without a submission has no score and no responses; it stays NULL
+    responded = set(student_ids)
+    score_updates = [
+        {"id": student.id, "score": scores.get(student.id, 0), "total_marks": answer_key.total_marks}
+        for student in students
+        if (student.score is not None or student.id in responded)
+        and (student.score, student.total_marks) != (scores.get(student.id, 0), answer_key.total_marks)
+    ]
+    if score_updates:
+        db.execute(update(Student), score_updates)
+
+    # New drive version: every worker's cached answer key is stale from this commit on
+    db.execute(
+        update(Drive)
+        .where(Drive.id == drive_id)
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+    db.commit()
+
+    # Submissions from now on must grade against the corrected key (other workers
+    # see the new version; this one drops its entries right away)
+    exam_cache.invalidate(drive_id)
+    item_analysis_cache.invalidate(drive_id)
+    leaderboards.invalidate(drive_id)
+
+    return {
+        "responses_checked": len(response_ids),
+        "responses_changed": len(now_correct) + len(now_wrong),
+        "students_checked": len(students),
+        "students_rescored": len(score_updates),
+        "total_marks": answer_key.total_marks
+    }
@@ -0,0 +1,65 @@
+"""
+Validators for the polled drive endpoints: exam-status (company and admin),
+student drive-info and drive results.
+
+A poll's ETag is derived from what its body is built from - the drive row's
+updated_at and counters, the state derived from the clock (status, whether
+the window has run out) and, for results, an aggregate fingerprint of the
+drive's students - so an unchanged poll is answered 304 before the body is
+assembled or encoded. The tags are weak: exam-status bodies with the same tag
+differ in their time_remaining countdown, which is why the tag carries the
+window's end time instead and clients count down to that.
+"""
+from typing import Optional
+from sqlalchemy import BigInteger, case, cast, func
+from sqlalchemy.orm import Session
+from app.database.config import settings
+from app.models import Drive, Student
+from app.utils.etag import REVALIDATE, make_etag
+
+
+def drive_etag(drive: Drive, *derived) -> str:
+    """Weak ETag of a response built from a drive row plus values derived from it"""
+    return "W/" + make_etag(drive.id, drive.updated_at, drive.student_count, drive.question_count, *derived)
+
+
+def results_fingerprint(db: Session, drive_id: int) -> tuple:
+    """
+    One aggregate over the drive's students that changes whenever a result does:
+    students added or removed, exams started or submitted, scores (including a
+    regrade that moves points between students), violations and disqualifications.
+    """
+    score = cast(func.coalesce(Student.score, 0), BigInteger)
+    violations = cast(func.coalesce(Student.total_violations, 0), BigInteger)
+    return tuple(db.query(
+        func.count(Student.id),
+        func.coalesce(func.sum(Student.id), 0),
+        func.count(Student.exam_started_at),
+        func.max(Student.exam_started_at),
+        func.count(Student.exam_submitted_at),
+        func.max(Student.exam_submitted_at),
+        func.coalesce(func.sum(case((Student.is_disqualified == True, Student.id), else_=0)), 0),
+        func.coalesce(func.sum(score), 0),
+        # Id-weighted sums: a change that keeps a column's total still changes these
+        func.coalesce(func.sum(score * Student.id), 0),
+        func.coalesce(func.sum(violations), 0),
+        func.coalesce(func.sum(violations * Student.id), 0),
+        func.coalesce(func.sum(Student.total_marks), 0)
+    ).filter(Student.drive_id == drive_id).one())
+
+
+def results_etag(drive: Drive, fingerprint: tuple, query_string: Optional[str]) -> str:
+    """Weak ETag of one results page (the filters, sort and cursor are part of the tag)"""
+    return drive_etag(drive, query_string or "", *fingerprint)
+
+
+def exam_status_cache_control(exam_state: str) -> str:
+    """
+    Cache-Control of an exam-status response. An ended window is only ever
+    reset by an admin suspension, so pollers may reuse that answer for
+    ENDED_STATUS_MAX_AGE_SECONDS; anything else is revalidated on every poll
+    (a start or end must show up immediately).
+    """
+    if exam_state == "ended" and settings.ended_status_max_age_seconds > 0:
+        return f"private, max-age={settings.ended_status_max_age_seconds}"
+    return REVALIDATE
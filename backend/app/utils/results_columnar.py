@@ -0,0 +1,172 @@
+"""
+Columnar (Parquet / Arrow IPC) export of drive results for analytics.
+
+Rows are read with the same streaming join as the CSV export and converted to
+typed Arrow record batches of COLUMNAR_BATCH_SIZE students. Each batch is
+written (one Parquet row group / IPC record batch) and flushed to the client
+before the next is built. pyarrow is imported lazily so the API does not pay
+for it unless a columnar export is requested.
+"""
+from typing import Iterator, List
+from app.database.connection import SessionLocal
+from app.models.student import Student
+from app.utils.results_export import iter_students_with_responses
+from app.utils.violation_buffer import VIOLATION_TYPES
+
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    # IPC stream format: unlike the file format it allows each batch its own dictionaries
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Students per record batch (and Parquet row group)
+COLUMNAR_BATCH_SIZE = 5000
+
+
+def result_status(student) -> str:
+    """Same values as the results endpoint's result_status filter"""
+    if student.is_disqualified:
+        return "disqualified"
+    if student.exam_submitted_at:
+        return "submitted"
+    if student.exam_started_at:
+        return "in_progress"
+    return "not_started"
+
+
+def question_column(index: int) -> str:
+    return f"Q{index + 1}"
+
+
+def build_schema(num_questions: int):
+    import pyarrow as pa
+
+    fields = [
+        pa.field("id", pa.int64(), nullable=False),
+        pa.field("name", pa.string()),
+        pa.field("email", pa.string()),
+        pa.field("roll_number", pa.string()),
+        pa.field("phone", pa.string()),
+        pa.field("college_name", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("student_group_name", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("score", pa.int32()),
+        pa.field("total_marks", pa.int32()),
+        pa.field("percentage", pa.float64()),
+        pa.field("status", pa.dictionary(pa.int8(), pa.string())),
+        pa.field("is_disqualified", pa.bool_()),
+        pa.field("disqualification_reason", pa.string()),
+        pa.field("exam_started_at", pa.timestamp("us")),
+        pa.field("exam_submitted_at", pa.timestamp("us")),
+        pa.field("total_violations", pa.int32()),
+    ]
+    fields += [pa.field(f"violations_{violation_type}", pa.int32()) for violation_type in VIOLATION_TYPES]
+    # Selected option per question (questions in id order, like the CSV headers); null if unanswered
+    fields += [pa.field(question_column(i), pa.dictionary(pa.int8(), pa.string())) for i in range(num_questions)]
+    return pa.schema(fields)
+
+
+def _empty_columns(schema) -> dict:
+    return {name: [] for name in schema.names}
+
+
+def _append_student(columns: dict, student, response_map: dict, question_ids: List[int]):
+    percentage = None
+    if student.total_marks and student.total_marks > 0:
+        percentage = student.score / student.total_marks * 100
+    violations = student.violation_details or {}
+
+    columns["id"].append(student.id)
+    columns["name"].append(student.name)
+    columns["email"].append(student.email)
+    columns["roll_number"].append(student.roll_number)
+    columns["phone"].append(student.phone)
+    columns["college_name"].append(student.college_name)
+    columns["student_group_name"].append(student.student_group_name)
+    columns["score"].append(student.score)
+    columns["total_marks"].append(student.total_marks)
+    columns["percentage"].append(percentage)
+    columns["status"].append(result_status(student))
+    columns["is_disqualified"].append(bool(student.is_disqualified))
+    columns["disqualification_reason"].append(student.disqualification_reason)
+    columns["exam_started_at"].append(student.exam_started_at)
+    columns["exam_submitted_at"].append(student.exam_submitted_at)
+    columns["total_violations"].append(student.total_violations or 0)
+    for violation_type in VIOLATION_TYPES:
+        columns[f"violations_{violation_type}"].append(violations.get(violation_type, 0))
+    for i, question_id in enumerate(question_ids):
+        response = response_map.get(question_id)
+        selected = response.selected_option if response else None
+        columns[question_column(i)].append(selected.upper() if selected else None)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the response generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_columnar(drive_id: int, question_ids: List[int], fmt: str) -> Iterator[bytes]:
+    """Parquet file or Arrow IPC stream body for a drive's results, one record batch at a time"""
+    import pyarrow as pa
+
+    schema = build_schema(len(question_ids))
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    def write(columns: dict):
+        batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+        if fmt == "parquet":
+            writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            writer.write_batch(batch)
+
+    db = SessionLocal()
+    try:
+        columns = _empty_columns(schema)
+        count = 0
+        students = iter_students_with_responses(
+            db, drive_id, Student.phone, Student.disqualification_reason,
+            Student.total_violations, Student.violation_details
+        )
+        for student, response_map in students:
+            _append_student(columns, student, response_map, question_ids)
+            count += 1
+            if count == COLUMNAR_BATCH_SIZE:
+                write(columns)
+                columns = _empty_columns(schema)
+                count = 0
+                yield sink.drain()
+        if count:
+            write(columns)
+    finally:
+        db.close()
+
+    writer.close()
+    yield sink.drain()
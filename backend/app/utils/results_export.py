@@ -0,0 +1,151 @@
+"""
+Streaming drive result exports.
+
+Students (and, for the detailed export, their responses in one ordered outer
+join) are read with yield_per, which uses a server-side cursor on Postgres,
+and CSV is emitted in chunks as rows arrive. Memory stays flat regardless of
+drive size and the first bytes go out as soon as the header is written.
+"""
+import csv
+import io
+from itertools import groupby
+from typing import Callable, Iterator, List, Tuple
+from sqlalchemy import Row, and_
+from sqlalchemy.orm import Session
+from app.database.connection import SessionLocal
+from app.models.student import Student
+from app.models.student_response import StudentResponse
+from app.utils.question_order import resolve_question_order
+
+SUMMARY_HEADER = [
+    "Name", "Email", "Roll Number", "College", "Student Group", "Score", "Total",
+    "Percentage", "Status", "Is_Disqualified"
+]
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_FETCH_SIZE = 1000
+
+# Flush the CSV buffer to the client once it holds this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+STUDENT_COLUMNS = (
+    Student.id, Student.name, Student.email, Student.roll_number, Student.college_name,
+    Student.student_group_name, Student.score, Student.total_marks, Student.exam_started_at,
+    Student.exam_submitted_at, Student.is_disqualified
+)
+
+
+def summary_fields(student) -> list:
+    """The summary columns of one student (a Student or a row with the same attributes)"""
+    percentage = None
+    status = "Not Started"
+
+    if student.is_disqualified:
+        status = "Disqualified"
+    elif student.exam_submitted_at:
+        status = "Submitted"
+        if student.total_marks and student.total_marks > 0:
+            percentage = (student.score / student.total_marks) * 100
+    elif student.exam_started_at:
+        status = "In Progress"
+
+    return [
+        student.name,
+        student.email,
+        student.roll_number or "",
+        student.college_name or "",
+        student.student_group_name or "",
+        student.score if student.score is not None else "",
+        student.total_marks if student.total_marks is not None else "",
+        f"{percentage:.2f}" if percentage is not None else "",
+        status,
+        "Yes" if student.is_disqualified else "No"
+    ]
+
+
+def iter_summary_rows(db: Session, drive_id: int) -> Iterator[list]:
+    students = db.query(*STUDENT_COLUMNS).filter(
+        Student.drive_id == drive_id
+    ).order_by(Student.id).yield_per(EXPORT_FETCH_SIZE)
+
+    for student in students:
+        yield summary_fields(student)
+
+
+def iter_students_with_responses(db: Session, drive_id: int, *extra_columns) -> Iterator[Tuple[Row, dict]]:
+    """
+    (student, {question_id: response}) for every student of a drive, in id order,
+    from a single outer join of students and responses.
+    """
+    rows = db.query(
+        *STUDENT_COLUMNS,
+        *extra_columns,
+        StudentResponse.question_id,
+        StudentResponse.selected_option,
+        StudentResponse.is_correct
+    ).outerjoin(
+        StudentResponse,
+        and_(StudentResponse.student_id == Student.id, StudentResponse.drive_id == drive_id)
+    ).filter(
+        Student.drive_id == drive_id
+    ).order_by(Student.id).yield_per(EXPORT_FETCH_SIZE)
+
+    # The join yields one row per response; consecutive rows belong to the same student
+    for _, student_rows in groupby(rows, key=lambda row: row.id):
+        student_rows = list(student_rows)
+        response_map = {row.question_id: row for row in student_rows if row.question_id is not None}
+        yield student_rows[0], response_map
+
+
+def iter_detailed_rows(db: Session, drive_id: int, question_ids: List[int]) -> Iterator[list]:
+    """Summary columns plus one column per question, in the order the student saw them"""
+    num_questions = len(question_ids)
+    students = iter_students_with_responses(db, drive_id, Student.question_order, Student.question_seed)
+
+    for student, response_map in students:
+        question_answers = []
+        question_order = resolve_question_order(student, question_ids)
+        if question_order:
+            for q_id in question_order:
+                response = response_map.get(q_id)
+                if response and response.selected_option:
+                    # Show selected option and correctness
+                    correct_marker = "✓" if response.is_correct else "✗"
+                    question_answers.append(f"{response.selected_option.upper()} {correct_marker}")
+                else:
+                    question_answers.append("Not Answered")
+        else:
+            # If no question order (exam not started), fill with empty
+            question_answers = [""] * num_questions
+
+        # Pad or trim to match number of questions
+        question_answers += [""] * (num_questions - len(question_answers))
+        yield summary_fields(student) + question_answers[:num_questions]
+
+
+def stream_csv(header: list, make_rows: Callable[[Session], Iterator[list]]) -> Iterator[str]:
+    """
+    CSV response body, read through its own session. The caller must close the
+    request's session before returning the StreamingResponse: under the pinned
+    fastapi, get_db's cleanup only runs after the body has been sent.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(header)
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate()
+
+    db = SessionLocal()
+    try:
+        for row in make_rows(db):
+            writer.writerow(row)
+            if output.tell() >= EXPORT_CHUNK_SIZE:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+    finally:
+        db.close()
+
+    if output.tell():
+        yield output.getvalue()
@@ -0,0 +1,131 @@
+"""
+SQL-side building blocks for drive results: percentage and status computed in
+the query, filtering, sorting and keyset (cursor) pagination.
+"""
+import base64
+import binascii
+from typing import Optional, Tuple
+import orjson
+from sqlalchemy import Float, case, cast, func, literal, tuple_
+from sqlalchemy.orm import Query
+from app.models.student import Student
+
+RESULT_STATUSES = ("not_started", "in_progress", "submitted", "disqualified")
+
+# Largest page the results endpoint will return
+MAX_RESULTS_PAGE_SIZE = 1000
+
+
+def percentage_column():
+    """score / total_marks * 100 as a float, NULL when the student has no total"""
+    return case(
+        (Student.total_marks > 0, cast(Student.score * 100, Float) / Student.total_marks),
+        else_=None
+    )
+
+
+def status_column():
+    """Result status of a student; disqualification takes precedence"""
+    return case(
+        (Student.is_disqualified == True, literal("disqualified")),
+        (Student.exam_submitted_at.isnot(None), literal("submitted")),
+        (Student.exam_started_at.isnot(None), literal("in_progress")),
+        else_=literal("not_started")
+    )
+
+
+# Sort keys are coalesced so they are never NULL: keyset comparisons need a
+# total order, and NULLs (no score yet, no college) sort as the lowest values
+SORT_KEYS = {
+    "score": lambda: func.coalesce(Student.score, -1),
+    "percentage": lambda: func.coalesce(percentage_column(), -1.0),
+    "violations": lambda: func.coalesce(Student.total_violations, 0),
+    "name": lambda: Student.name,
+    "college": lambda: func.coalesce(Student.college_name, ""),
+    "group": lambda: func.coalesce(Student.student_group_name, ""),
+    "status": status_column,
+}
+
+
+def encode_cursor(sort_value, student_id: int) -> str:
+    """Opaque cursor pointing just past (sort_value, student_id)"""
+    return base64.urlsafe_b64encode(orjson.dumps([sort_value, student_id])).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[object, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        sort_value, student_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(student_id, int):
+        raise ValueError("Invalid cursor")
+    return sort_value, student_id
+
+
+def filter_results(
+    query: Query,
+    min_percentage: Optional[float] = None,
+    max_percentage: Optional[float] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    college_name: Optional[str] = None,
+    student_group_name: Optional[str] = None,
+    result_status: Optional[str] = None,
+    min_violations: Optional[int] = None,
+    max_violations: Optional[int] = None
+) -> Query:
+    """Apply the optional result filters; students without a total never match a percentage filter"""
+    if min_percentage is not None:
+        query = query.filter(percentage_column() >= min_percentage)
+    if max_percentage is not None:
+        query = query.filter(percentage_column() <= max_percentage)
+    if min_score is not None:
+        query = query.filter(Student.score >= min_score)
+    if max_score is not None:
+        query = query.filter(Student.score <= max_score)
+    if college_name is not None:
+        query = query.filter(Student.college_name == college_name)
+    if student_group_name is not None:
+        query = query.filter(Student.student_group_name == student_group_name)
+    if result_status is not None:
+        query = query.filter(status_column() == result_status)
+    if min_violations is not None:
+        query = query.filter(func.coalesce(Student.total_violations, 0) >= min_violations)
+    if max_violations is not None:
+        query = query.filter(func.coalesce(Student.total_violations, 0) <= max_violations)
+    return query
+
+
+def page_results(query: Query, sort_by: str, descending: bool, limit: Optional[int], cursor: Optional[str]):
+    """
+    Order by the sort key with the student id as tie-breaker and return one
+    page as (rows, next_cursor). Each row is (Student, percentage, sort_value).
+
+    The cursor is the (sort value, id) of the last row of the previous page,
+    so pages stay stable while results are being written: rows are never
+    skipped or repeated because of an offset shifting.
+    """
+    sort_key = SORT_KEYS[sort_by]()
+    query = query.add_columns(percentage_column(), sort_key)
+
+    if cursor is not None:
+        sort_value, student_id = decode_cursor(cursor)
+        position = tuple_(sort_key, Student.id)
+        query = query.filter(position < (sort_value, student_id) if descending else position > (sort_value, student_id))
+
+    if descending:
+        query = query.order_by(sort_key.desc(), Student.id.desc())
+    else:
+        query = query.order_by(sort_key.asc(), Student.id.asc())
+
+    if limit is None:
+        return query.all(), None
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_student, _, last_sort_value = rows[-1]
+    return rows, encode_cursor(last_sort_value, last_student.id)
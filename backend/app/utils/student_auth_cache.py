@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from app.database.config import settings
+from app.models.student import Student
+
+
+class CachedStudent:
+    """Read-only snapshot of the student fields the read-mostly exam endpoints need"""
+
+    __slots__ = (
+        "id", "drive_id", "access_token", "is_disqualified", "disqualification_reason",
+        "exam_started_at", "exam_submitted_at", "question_order", "question_seed"
+    )
+
+    def __init__(self, student: Student):
+        self.id = student.id
+        self.drive_id = student.drive_id
+        self.access_token = student.access_token
+        self.is_disqualified = student.is_disqualified
+        self.disqualification_reason = student.disqualification_reason
+        self.exam_started_at = student.exam_started_at
+        self.exam_submitted_at = student.exam_submitted_at
+        self.question_order = student.question_order
+        self.question_seed = student.question_seed
+
+
+class StudentAuthCache:
+    """
+    Bounded LRU cache of access token -> CachedStudent with a TTL.
+
+    Every endpoint that changes a student's exam state invalidates the token
+    (or the whole drive). The cache is per process, so with several workers the
+    TTL bounds how long another worker can serve a stale snapshot.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (expires_at, CachedStudent)
+        self._drive_tokens: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[CachedStudent]:
+        """Return the cached snapshot for a token, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return cached
+
+    def put(self, student: Student) -> CachedStudent:
+        """Snapshot a student row and cache it under its access token"""
+        cached = CachedStudent(student)
+        if self.max_size <= 0:
+            return cached
+
+        with self._lock:
+            self._remove(cached.access_token)
+            self._entries[cached.access_token] = (time.monotonic() + self.ttl_seconds, cached)
+            self._drive_tokens.setdefault(cached.drive_id, set()).add(cached.access_token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+        return cached
+
+    def invalidate(self, token: str):
+        """Drop a single student's snapshot"""
+        with self._lock:
+            self._remove(token)
+
+    def invalidate_drive(self, drive_id: int):
+        """Drop the snapshots of every student in a drive"""
+        with self._lock:
+            for token in self._drive_tokens.pop(drive_id, set()):
+                self._entries.pop(token, None)
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._drive_tokens.get(entry[1].drive_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._drive_tokens[entry[1].drive_id]
+
+
+student_auth_cache = StudentAuthCache(
+    max_size=settings.student_auth_cache_size,
+    ttl_seconds=settings.student_auth_cache_ttl_seconds
+)
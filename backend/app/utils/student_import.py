@@ -0,0 +1,121 @@
+"""
+Streaming import of a student roster CSV into a drive.
+
+The upload is decoded and parsed incrementally from the spooled upload file,
+so memory does not grow with the file. Emails already in the drive are loaded
+with one query, so deduplicating a row (against the drive or earlier rows of
+the file) is a set lookup instead of a query. New students are bulk-inserted
+INSERT_CHUNK_SIZE rows per executemany, all in the caller's transaction.
+Invalid rows are skipped and reported by row number.
+
+(drive_id, email) is not unique in the schema, so every path that checks a
+drive's roster for an email before inserting holds lock_drive_roster() until
+its commit; concurrent imports into one drive run one after the other.
+"""
+import csv
+import io
+import uuid
+from typing import BinaryIO, Dict, List, Set
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import Drive, Student
+from app.utils.drive_counters import adjust_drive_counters
+
+STUDENT_REQUIRED_COLUMNS = ["name", "email", "roll_number"]
+STUDENT_OPTIONAL_COLUMNS = {"phone": "phone", "college": "college_name", "student_group": "student_group_name"}
+
+# Students per INSERT statement
+INSERT_CHUNK_SIZE = 1000
+
+# Row errors returned to the client (error_count is always the full count)
+MAX_REPORTED_ERRORS = 1000
+
+
+def _value(row: dict, column: str) -> str:
+    # Short rows leave trailing columns as None
+    return (row.get(column) or "").strip()
+
+
+def lock_drive_roster(db: Session, drive_id: int):
+    """Lock the drive row (SELECT ... FOR UPDATE) until the caller's transaction ends"""
+    db.query(Drive.id).filter(Drive.id == drive_id).with_for_update().scalar()
+
+
+def import_students_csv(db: Session, drive_id: int, company_id: int, upload: BinaryIO) -> Dict:
+    """
+    Insert the new students of a roster CSV and adjust the drive's counters
+    (does not commit; the drive stays locked until the caller does). Raises ValueError if required columns are missing and
+    UnicodeDecodeError if the file is not UTF-8.
+    """
+    # newline="" as the csv module requires; utf-8-sig drops a spreadsheet's BOM
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        fieldnames = [name.strip() for name in reader.fieldnames or []]
+        missing = [column for column in STUDENT_REQUIRED_COLUMNS if column not in fieldnames]
+        if missing:
+            raise ValueError(
+                f"CSV must contain columns: {', '.join(STUDENT_REQUIRED_COLUMNS)}. Optional: {', '.join(STUDENT_OPTIONAL_COLUMNS)}"
+            )
+        reader.fieldnames = fieldnames
+
+        lock_drive_roster(db, drive_id)
+        existing: Set[str] = {email for (email,) in db.query(Student.email).filter(Student.drive_id == drive_id)}
+        file_emails: Set[str] = set()
+        pending: List[dict] = []
+        errors: List[dict] = []
+        error_count = added = duplicates_in_file = duplicates_in_drive = 0
+
+        def flush():
+            nonlocal added
+            if pending:
+                db.execute(insert(Student), pending)
+                added += len(pending)
+                pending.clear()
+
+        for row_num, row in enumerate(reader, start=2):  # Start from 2 because of header
+            email = _value(row, "email").lower()
+            missing_values = [column for column in STUDENT_REQUIRED_COLUMNS if not _value(row, column)]
+            if missing_values or "@" not in email:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    reason = f"Missing fields: {', '.join(missing_values)}" if missing_values else "Invalid email"
+                    errors.append({"row": row_num, "email": email or None, "error": reason})
+                continue
+
+            # Skip duplicate students
+            if email in file_emails:
+                duplicates_in_file += 1
+                continue
+            if email in existing:
+                duplicates_in_drive += 1
+                continue
+            file_emails.add(email)
+
+            student = {
+                "drive_id": drive_id,
+                "company_id": company_id,
+                "name": _value(row, "name"),
+                "email": email,
+                "roll_number": _value(row, "roll_number"),
+                "access_token": str(uuid.uuid4())
+            }
+            for column, attribute in STUDENT_OPTIONAL_COLUMNS.items():
+                student[attribute] = _value(row, column) or None
+            pending.append(student)
+            if len(pending) >= INSERT_CHUNK_SIZE:
+                flush()
+
+        flush()
+    finally:
+        # Leave the upload's file open for the framework to close
+        text.detach()
+
+    adjust_drive_counters(db, drive_id, students=added)
+    return {
+        "added": added,
+        "duplicates_in_file": duplicates_in_file,
+        "duplicates_in_drive": duplicates_in_drive,
+        "error_count": error_count,
+        "errors": errors
+    }
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database.connection import SessionLocal
+from app.models.student import Student
+
+logger = logging.getLogger(__name__)
+
+VIOLATION_TYPES = ("tab_switch", "fullscreen_exit", "right_click", "screenshot", "copy", "paste")
+
+# Entries with nothing pending are dropped after this long without a new violation
+IDLE_EVICT_SECONDS = 600
+
+
+def empty_violations() -> Dict[str, int]:
+    """Violation counters for a student that has not committed any violations"""
+    return {violation_type: 0 for violation_type in VIOLATION_TYPES}
+
+
+def merge_violations(base: Optional[Dict[str, int]], deltas: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """Return a new counter dict with the deltas added to the base counts"""
+    merged = empty_violations()
+    merged.update(base or {})
+    for violation_type, count in (deltas or {}).items():
+        merged[violation_type] = merged.get(violation_type, 0) + count
+    return merged
+
+
+def apply_violations(db: Session, student_id: int, deltas: Dict[str, int]) -> Dict[str, int]:
+    """
+    Add violation increments to a student's stored counters (does not commit).
+    The row is locked while it is merged, as in ViolationBuffer.flush(), so a
+    concurrent flush of the same student cannot overwrite the increments.
+    Returns the new counts.
+    """
+    stored = db.query(Student.violation_details).filter(
+        Student.id == student_id
+    ).with_for_update().scalar()
+    violations = merge_violations(stored, deltas)
+    db.execute(
+        update(Student).where(Student.id == student_id).values(
+            violation_details=violations,
+            total_violations=sum(violations.values())
+        )
+    )
+    return violations
+
+
+class _Entry:
+    __slots__ = ("base", "pending", "last_seen")
+
+    def __init__(self, base: Dict[str, int]):
+        self.base = base  # Counts as of the last load/flush
+        self.pending: Dict[str, int] = {}  # Increments not yet written to the database
+        self.last_seen = time.monotonic()
+
+
+class ViolationBuffer:
+    """
+    Write-behind buffer for violation counters.
+
+    record() only touches memory (plus one read the first time a student is
+    seen); flush() writes the pending increments of all students in one
+    transaction with a batched UPDATE. Increments are merged into the row that
+    is in the database at flush time, so several workers can buffer
+    violations for the same student without losing counts.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def record(self, db: Session, student_id: int, violation_type: str, count: int = 1) -> Dict[str, int]:
+        """Buffer violations for a student and return their current counts"""
+        return self.record_many(db, student_id, {violation_type: count})
+
+    def record_many(self, db: Session, student_id: int, counts: Dict[str, int]) -> Dict[str, int]:
+        """Buffer several violation increments for a student atomically and return their current counts"""
+        if student_id not in self._entries:
+            stored = db.query(Student.violation_details).filter(Student.id == student_id).scalar()
+            with self._lock:
+                self._entries.setdefault(student_id, _Entry(merge_violations(stored, None)))
+
+        with self._lock:
+            entry = self._entries[student_id]
+            for violation_type, count in counts.items():
+                entry.pending[violation_type] = entry.pending.get(violation_type, 0) + count
+            entry.last_seen = time.monotonic()
+            return merge_violations(entry.base, entry.pending)
+
+    def take(self, student_id: int) -> Dict[str, int]:
+        """Remove a student from the buffer and return their unflushed increments"""
+        with self._lock:
+            entry = self._entries.pop(student_id, None)
+        return entry.pending if entry else {}
+
+    def discard(self, student_ids: Iterable[int]):
+        """Forget buffered state for students whose counters were reset"""
+        with self._lock:
+            for student_id in student_ids:
+                self._entries.pop(student_id, None)
+
+    def flush(self, db: Session) -> int:
+        """Write all pending increments in one transaction; returns the number of students updated"""
+        with self._lock:
+            batch = {}
+            for student_id, entry in self._entries.items():
+                if entry.pending:
+                    batch[student_id] = entry.pending
+                    entry.pending = {}
+
+            now = time.monotonic()
+            for student_id in [sid for sid, entry in self._entries.items()
+                               if not entry.pending and now - entry.last_seen > IDLE_EVICT_SECONDS]:
+                del self._entries[student_id]
+
+        if not batch:
+            return 0
+
+        try:
+            rows = db.query(Student.id, Student.violation_details).filter(
+                Student.id.in_(list(batch))
+            ).with_for_update().all()
+
+            merged = {row.id: merge_violations(row.violation_details, batch[row.id]) for row in rows}
+            if merged:
+                db.execute(update(Student), [
+                    {
+                        "id": student_id,
+                        "violation_details": violations,
+                        "total_violations": sum(violations.values())
+                    }
+                    for student_id, violations in merged.items()
+                ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                for student_id, deltas in batch.items():
+                    entry = self._entries.get(student_id)
+                    if entry is not None:
+                        for violation_type, count in deltas.items():
+                            entry.pending[violation_type] = entry.pending.get(violation_type, 0) + count
+            raise
+
+        with self._lock:
+            for student_id, violations in merged.items():
+                entry = self._entries.get(student_id)
+                if entry is not None:
+                    entry.base = violations
+
+        return len(merged)
+
+
+violation_buffer = ViolationBuffer()
+
+
+def flush_violation_buffer() -> int:
+    """Flush the violation buffer using a fresh session"""
+    db = SessionLocal()
+    try:
+        return violation_buffer.flush(db)
+    finally:
+        db.close()
+
+
+async def run_violation_flusher(interval_seconds: float):
+    """Background task: flush buffered violations every interval until cancelled"""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(flush_violation_buffer)
+            except Exception as e:
+                logger.error(f"Violation buffer flush failed: {str(e)}")
+    finally:
+        # Final flush on shutdown
+        try:
+            await run_in_threadpool(flush_violation_buffer)
+        except Exception as e:
+            logger.error(f"Final violation buffer flush failed: {str(e)}")
@@ -0,0 +1,136 @@
+"""
+Benchmark: persisting exam answers on submit.
+
+Compares the old submit path (one StudentResponse ORM object per answer,
+db.add() each, commit, refresh the student) with the current one (a single
+executemany INSERT of plain dicts).
+
+Usage (from the backend directory):
+    python -m benchmarks.submit_responses
+    python -m benchmarks.submit_responses --database-url postgresql+psycopg://user:pw@localhost/bench --submits 300 --answers 200
+
+Use a scratch database: the tables are created in it and the rows written by
+the benchmark are deleted after each run.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+from app.database.connection import Base
+from app.models import Company, Drive, Question, Student, StudentResponse
+
+
+def seed(db, answers: int, submits: int):
+    """Create one drive with the given number of questions and students; returns (drive_id, question_ids, student_ids)"""
+    tag = time.time_ns()
+    company = Company(company_name="Bench Co", username=f"bench-{tag}", email=f"bench-{tag}@example.com", hashed_password="x")
+    db.add(company)
+    db.flush()
+
+    drive = Drive(company_id=company.id, title="Benchmark drive", category="Technical MCQ", exam_duration_minutes=60)
+    db.add(drive)
+    db.flush()
+
+    questions = [
+        Question(drive_id=drive.id, question_text=f"Q{i}", option_a="a", option_b="b", option_c="c", option_d="d", correct_answer="A", points=1)
+        for i in range(answers)
+    ]
+    students = [
+        Student(drive_id=drive.id, company_id=company.id, name=f"S{i}", email=f"s{i}@bench.example.com")
+        for i in range(submits)
+    ]
+    db.add_all(questions + students)
+    db.commit()
+    return drive.id, [q.id for q in questions], [s.id for s in students]
+
+
+def submit_orm(db, student, drive_id, question_ids):
+    """Old path: one ORM object per answer"""
+    for question_id in question_ids:
+        db.add(StudentResponse(
+            student_id=student.id,
+            question_id=question_id,
+            drive_id=drive_id,
+            selected_option="A",
+            is_correct=True,
+            marked_for_review=False,
+            answered_at=datetime.utcnow()
+        ))
+    student.exam_submitted_at = datetime.utcnow()
+    db.commit()
+    db.refresh(student)
+
+
+def submit_bulk(db, student, drive_id, question_ids):
+    """Current path: a single executemany INSERT"""
+    answered_at = datetime.utcnow()
+    db.execute(insert(StudentResponse), [
+        {
+            "student_id": student.id,
+            "question_id": question_id,
+            "drive_id": drive_id,
+            "selected_option": "A",
+            "is_correct": True,
+            "marked_for_review": False,
+            "answered_at": answered_at
+        }
+        for question_id in question_ids
+    ])
+    student.exam_submitted_at = answered_at
+    db.commit()
+
+
+def run(Session, submit, drive_id, question_ids, student_ids):
+    """Time one submit per student; returns per-submit durations in seconds"""
+    durations = []
+    db = Session()
+    try:
+        for student_id in student_ids:
+            student = db.get(Student, student_id)
+            started = time.perf_counter()
+            submit(db, student, drive_id, question_ids)
+            durations.append(time.perf_counter() - started)
+            db.expunge_all()
+
+        db.execute(delete(StudentResponse).where(StudentResponse.drive_id == drive_id))
+        db.commit()
+    finally:
+        db.close()
+    return durations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.submit_responses", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://", help="Scratch database (default: in-memory SQLite)")
+    parser.add_argument("--submits", type=int, default=200, help="Number of exam submissions per strategy")
+    parser.add_argument("--answers", type=int, default=100, help="Answers per submission")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    db = Session()
+    try:
+        drive_id, question_ids, student_ids = seed(db, args.answers, args.submits)
+    finally:
+        db.close()
+
+    results = {}
+    for name, submit in (("orm add()", submit_orm), ("bulk insert", submit_bulk)):
+        durations = run(Session, submit, drive_id, question_ids, student_ids)
+        results[name] = durations
+        print(
+            f"{name:<12} total {sum(durations):8.3f}s  "
+            f"mean {statistics.mean(durations) * 1000:7.2f}ms  "
+            f"p95 {sorted(durations)[int(len(durations) * 0.95) - 1] * 1000:7.2f}ms"
+        )
+
+    speedup = sum(results["orm add()"]) / sum(results["bulk insert"])
+    print(f"speedup: {speedup:.1f}x ({args.submits} submits x {args.answers} answers)")
+
+
+if __name__ == "__main__":
+    main()
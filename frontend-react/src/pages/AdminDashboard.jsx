@@ -3,7 +3,7 @@ import { toast } from 'react-toastify';
 import { useAuth } from '../contexts/AuthContext';
 import api from '../lib/api';
 import AdminColleges from './AdminColleges';
-import { formatDateUTC, formatDateLocal } from '../utils/timezone';
+import { formatDateUTC, formatDateLocal, secondsUntilUTC } from '../utils/timezone';
 
 export default function AdminDashboard() {
   const { logout } = useAuth();
@@ -245,9 +245,10 @@ export default function AdminDashboard() {
 
       statuses.forEach(({ driveId, status }) => {
         statusMap[driveId] = status;
-        // Initialize client-side countdown with server time
+        // Initialize client-side countdown from the window's end time (a 304 reuses an
+        // earlier body, so its time_remaining can be behind)
         if (status && status.time_remaining) {
-          timeMap[driveId] = status.time_remaining;
+          timeMap[driveId] = secondsUntilUTC(status.actual_window_end || status.window_end);
         }
       });
 
@@ -1255,7 +1256,7 @@ export default function AdminDashboard() {
                     </button>
                   </>
                 )}
-                {driveDetailData.status === 'approved' && (
+                {driveDetailData.is_approved && driveDetailData.status !== 'suspended' && (
                   <button
                     onClick={() =>
                       setApprovalModal({
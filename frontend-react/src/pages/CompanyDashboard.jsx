@@ -3,7 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import api from '../lib/api';
 import { useAuth } from '../contexts/AuthContext';
-import { formatDateUTC } from '../utils/timezone';
+import { formatDateUTC, secondsUntilUTC } from '../utils/timezone';
 
 // Main component for the Company Dashboard
 const CompanyDashboard = () => {
@@ -185,9 +185,10 @@ const CompanyDashboard = () => {
 
       statuses.forEach(({ driveId, status }) => {
         statusMap[driveId] = status;
-        // Initialize client-side countdown with server time
+        // Initialize client-side countdown from the window's end time (a 304 reuses an
+        // earlier body, so its time_remaining can be behind)
         if (status && status.time_remaining) {
-          timeMap[driveId] = status.time_remaining;
+          timeMap[driveId] = secondsUntilUTC(status.actual_window_end || status.window_end);
         }
       });
 
@@ -3,7 +3,7 @@ import { useNavigate, useSearchParams } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../contexts/AuthContext';
 import api from '../lib/api';
-import { formatDateUTC } from '../utils/timezone';
+import { formatDateUTC, secondsUntilUTC } from '../utils/timezone';
 
 export default function CompanyDriveDetail() {
   const navigate = useNavigate();
@@ -28,6 +28,8 @@ export default function CompanyDriveDetail() {
   const [results, setResults] = useState([]);
   const [minPercentage, setMinPercentage] = useState(0);
   const [isLoadingResults, setIsLoadingResults] = useState(false);
+  const [resultsCursor, setResultsCursor] = useState(null);
+  const [filteredCount, setFilteredCount] = useState(0);
 
   useEffect(() => {
     if (!driveId) {
@@ -146,14 +148,20 @@ export default function CompanyDriveDetail() {
         );
         toast.success('Questions uploaded successfully!');
       } else if (type === 'students') {
-        await api.post(
+        const res = await api.post(
           `/company/drives/${driveId}/students/csv-upload`,
           formData,
           {
             headers: { 'Content-Type': undefined },
           }
         );
-        toast.success('Students uploaded successfully!');
+        toast.success(res.data.message || 'Students uploaded successfully!');
+        if (res.data.error_count > 0) {
+          const firstError = res.data.errors[0];
+          toast.info(
+            `${res.data.error_count} invalid rows skipped (row ${firstError.row}: ${firstError.error})`
+          );
+        }
       }
 
       // Wait a moment for backend to process, then reload data
@@ -168,13 +176,24 @@ export default function CompanyDriveDetail() {
     }
   };
 
+  const RESULTS_PAGE_SIZE = 200;
+
+  const fetchResultsPage = (cursor) =>
+    api.get(`/company/drives/${driveId}/results`, {
+      params: {
+        limit: RESULTS_PAGE_SIZE,
+        ...(minPercentage > 0 ? { min_percentage: minPercentage } : {}),
+        ...(cursor ? { cursor } : {}),
+      },
+    });
+
   const loadResults = async () => {
     setIsLoadingResults(true);
     try {
-      const res = await api.get(`/company/drives/${driveId}/results`, {
-        params: minPercentage > 0 ? { min_percentage: minPercentage } : {},
-      });
+      const res = await fetchResultsPage(null);
       setResults(res.data.results || []);
+      setResultsCursor(res.data.next_cursor);
+      setFilteredCount(res.data.filtered_students);
       toast.success(
         `Loaded ${res.data.filtered_students} of ${res.data.total_students} students`
       );
@@ -186,6 +205,19 @@ export default function CompanyDriveDetail() {
     }
   };
 
+  const loadMoreResults = async () => {
+    if (!resultsCursor) return;
+    try {
+      const res = await fetchResultsPage(resultsCursor);
+      setResults((prev) => [...prev, ...(res.data.results || [])]);
+      setResultsCursor(res.data.next_cursor);
+      setFilteredCount(res.data.filtered_students);
+    } catch (err) {
+      toast.error(err?.response?.data?.detail || 'Failed to load results');
+      console.error('Failed to load more results:', err);
+    }
+  };
+
   const exportResults = async (format) => {
     try {
       const response = await api.get(
@@ -537,7 +569,7 @@ export default function CompanyDriveDetail() {
                                   <p className="text-lg font-bold text-green-900">
                                     ⏱️ Time Remaining:{' '}
                                     {Math.round(
-                                      examStatus.time_remaining_minutes
+                                      secondsUntilUTC(examStatus.actual_window_end || examStatus.window_end) / 60
                                     )}{' '}
                                     minutes
                                   </p>
@@ -1060,11 +1092,19 @@ export default function CompanyDriveDetail() {
                           </tbody>
                         </table>
                       </div>
-                      <div className="bg-gray-50 px-6 py-4 border-t border-gray-200">
+                      <div className="bg-gray-50 px-6 py-4 border-t border-gray-200 flex items-center justify-between">
                         <p className="text-sm text-gray-600 font-semibold">
                           <span className="text-indigo-600">📊</span> Showing{' '}
-                          {results.length} student(s)
+                          {results.length} of {filteredCount} student(s)
                         </p>
+                        {resultsCursor && (
+                          <button
+                            onClick={loadMoreResults}
+                            className="bg-indigo-600 hover:bg-indigo-700 text-white px-4 py-2 rounded-lg text-sm font-semibold transition"
+                          >
+                            Load more
+                          </button>
+                        )}
                       </div>
                     </div>
                   )}
@@ -3,7 +3,7 @@ import { useNavigate, useSearchParams } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { useAuth } from '../contexts/AuthContext';
 import api from '../lib/api';
-import { formatDateUTC } from '../utils/timezone';
+import { formatDateUTC, secondsUntilUTC } from '../utils/timezone';
 
 export default function CompanySendEmails() {
   const navigate = useNavigate();
@@ -483,7 +483,7 @@ export default function CompanySendEmails() {
                         {examStatus.exam_state === 'ongoing' && (
                           <p className="text-green-700 text-sm">
                             🟢 Status: <strong>Ongoing</strong> - Time remaining:{' '}
-                            {Math.round(examStatus.time_remaining_minutes || 0)} minutes
+                            {Math.round((secondsUntilUTC(examStatus.actual_window_end || examStatus.window_end) || 0) / 60)} minutes
                           </p>
                         )}
                         {(examStatus.exam_state === 'completed' ||
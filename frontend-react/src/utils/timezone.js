@@ -147,3 +147,23 @@ export const formatDateLocal = (date) => {
 
   return d.toLocaleString('en-GB', options);
 };
+
+/**
+ * Seconds from now until a UTC datetime from the backend
+ * @param {string|Date} date - Date to count down to (already in UTC from backend)
+ * @returns {number|null} Whole seconds remaining (0 once it has passed), or null if not set
+ */
+export const secondsUntilUTC = (date) => {
+  if (!date) return null;
+
+  // Backend sends naive datetime strings - treat as UTC
+  let d;
+  if (typeof date === 'string') {
+    const isoString = date + (date.includes('Z') ? '' : 'Z');
+    d = new Date(isoString);
+  } else {
+    d = date;
+  }
+
+  return Math.max(Math.floor((d - Date.now()) / 1000), 0);
+};
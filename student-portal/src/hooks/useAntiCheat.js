@@ -16,6 +16,11 @@ const VIOLATION_THRESHOLDS = {
   paste: null, // Warning only
 };
 
+// Violations are sent together once this long has passed since the first unsent one
+const VIOLATION_BATCH_DELAY_MS = 1000;
+// Largest batch the backend accepts in one request
+const VIOLATION_BATCH_MAX_EVENTS = 100;
+
 export const useAntiCheat = (onDisqualified, isExamActive) => {
   console.log('useAntiCheat - isExamActive:', isExamActive); // Debug log
 
@@ -33,10 +38,46 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
   const recordingRef = useRef({});
   const fullscreenStateRef = useRef(false);
   const disqualifiedRef = useRef(false); // Track if already disqualified to prevent duplicate alerts
+  const pendingViolationsRef = useRef([]); // Violations not yet sent to the backend
+  const flushTimerRef = useRef(null);
 
   // Calculate total violations
   const totalViolations = Object.values(localViolations).reduce((sum, count) => sum + count, 0);
 
+  // Send all queued violations in batch requests
+  const flushViolations = useCallback(async () => {
+    clearTimeout(flushTimerRef.current);
+    flushTimerRef.current = null;
+
+    const events = pendingViolationsRef.current;
+    pendingViolationsRef.current = [];
+    if (events.length === 0) return;
+
+    try {
+      const token = localStorage.getItem('student_access_token');
+      if (!token) {
+        console.error('❌ No access token found!');
+        return;
+      }
+
+      console.log(`📡 Sending ${events.length} violation(s) to backend...`);
+      for (let i = 0; i < events.length; i += VIOLATION_BATCH_MAX_EVENTS) {
+        const response = await axios.post(
+          API_ENDPOINTS.recordViolationsBatch,
+          { events: events.slice(i, i + VIOLATION_BATCH_MAX_EVENTS) },
+          { params: { token }, headers: { Authorization: `Bearer ${token}` } }
+        );
+        console.log('✅ Violations recorded in backend:', response.data);
+      }
+    } catch (error) {
+      console.error('Error recording violations in backend:', error);
+      console.error('Error details:', error.response?.data);
+    }
+  }, []);
+
+  // Send anything still queued when the exam page goes away
+  useEffect(() => () => { flushViolations(); }, [flushViolations]);
+
   const disqualifyStudent = useCallback(async (violationType, reason) => {
     // Prevent duplicate disqualification calls
     if (disqualifiedRef.current) {
@@ -45,6 +86,9 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
     }
     disqualifiedRef.current = true;
 
+    // Queued violations must reach the backend before the exam is closed
+    await flushViolations();
+
     try {
       const token = localStorage.getItem('student_access_token');
       if (!token) {
@@ -81,7 +125,7 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
       console.error('Error details:', error.response?.data);
       disqualifiedRef.current = false; // Reset on error
     }
-  }, [onDisqualified]);
+  }, [onDisqualified, flushViolations]);
 
   const recordViolation = useCallback(
     async (violationType) => {
@@ -98,6 +142,12 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
 
       console.log('🔴 Recording violation:', violationType); // Debug log
 
+      // Queue the violation for the next batch (queued first so a disqualification sends it)
+      pendingViolationsRef.current.push({ violation_type: violationType });
+      if (!flushTimerRef.current) {
+        flushTimerRef.current = setTimeout(flushViolations, VIOLATION_BATCH_DELAY_MS);
+      }
+
       // Increment local violation count
       setLocalViolations(prev => {
         const newCount = prev[violationType] + 1;
@@ -146,30 +196,8 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
 
         return newViolations;
       });
-
-      // Send violation to backend for recording
-      try {
-        const token = localStorage.getItem('student_access_token');
-        if (!token) {
-          console.error('❌ No access token found!');
-          return;
-        }
-
-        console.log('📡 Sending violation to backend...');
-        const response = await axios.post(
-          API_ENDPOINTS.recordViolation,
-          { violation_type: violationType },
-          { params: { token }, headers: { Authorization: `Bearer ${token}` } }
-        );
-
-        console.log('✅ Violation recorded in backend:', response.data);
-
-      } catch (error) {
-        console.error('Error recording violation in backend:', error);
-        console.error('Error details:', error.response?.data);
-      }
     },
-    [isExamActive, disqualifyStudent]
+    [isExamActive, disqualifyStudent, flushViolations]
   );
 
   // Tab switch detection
@@ -418,5 +446,5 @@ export const useAntiCheat = (onDisqualified, isExamActive) => {
     }
   };
 
-  return { requestFullscreen, localViolations, totalViolations };
+  return { requestFullscreen, flushViolations, localViolations, totalViolations };
 };
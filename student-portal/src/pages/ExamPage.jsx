@@ -37,7 +37,7 @@ const ExamPage = () => {
     [navigate, student?.email]
   );
 
-  const { requestFullscreen } = useAntiCheat(handleDisqualified, examStarted);
+  const { requestFullscreen, flushViolations } = useAntiCheat(handleDisqualified, examStarted);
 
   // Define submit handlers before they're used in effects
   const handleSubmit = useCallback(
@@ -74,6 +74,9 @@ const ExamPage = () => {
 
         console.log('Submitting answers:', answersList);
 
+        // Queued violations must be recorded before the exam is submitted
+        await flushViolations();
+
         const response = await axios.post(
           API_ENDPOINTS.submitExam,
           { answers: answersList },
@@ -113,7 +116,7 @@ const ExamPage = () => {
         setExamSubmitted(false); // Reset on error
       }
     },
-    [examData, answers, markedForReview, navigate, submitting, examSubmitted]
+    [examData, answers, markedForReview, navigate, submitting, examSubmitted, flushViolations]
   );
 
   const handleAutoSubmit = useCallback(() => {
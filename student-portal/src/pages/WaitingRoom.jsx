@@ -14,6 +14,51 @@ const WaitingRoom = () => {
   const [loading, setLoading] = useState(true);
   const [windowTimeRemaining, setWindowTimeRemaining] = useState(null);
 
+  // Update the page from a drive-info payload (from /drive-info or the drive events stream)
+  const applyDriveInfo = (driveInfo) => {
+    setDriveDetails(driveInfo);
+
+    // Calculate window time remaining
+    // Priority: actual_window_end (set when manually ended) > window_end (scheduled)
+    // Backend sends UTC datetime strings - parse them as UTC
+    const windowEndTime = driveInfo.actual_window_end || driveInfo.window_end;
+
+    if (windowEndTime) {
+      // Parse UTC datetime string as UTC
+      let windowEnd;
+      if (typeof windowEndTime === 'string') {
+        const isoString = windowEndTime + (windowEndTime.includes('Z') ? '' : 'Z');
+        windowEnd = new Date(isoString);
+      } else {
+        windowEnd = new Date(windowEndTime);
+      }
+
+      // Store window end time in localStorage for disqualification logic
+      localStorage.setItem('exam_window_end', windowEnd.toISOString());
+
+      const now = new Date();
+      const diffMs = windowEnd - now;
+
+      console.log('Window end calculation:', {
+        actual_window_end: driveInfo.actual_window_end,
+        window_end: driveInfo.window_end,
+        using: windowEndTime,
+        windowEnd_ISO: windowEnd.toISOString(),
+        now_ISO: now.toISOString(),
+        diffMs,
+        diffMinutes: Math.floor(diffMs / 60000)
+      });
+
+      if (diffMs > 0) {
+        const hours = Math.floor(diffMs / 3600000);
+        const minutes = Math.floor((diffMs % 3600000) / 60000);
+        setWindowTimeRemaining(`${hours}h ${minutes}m`);
+      } else {
+        setWindowTimeRemaining('Closed');
+      }
+    }
+  };
+
   // Function to check drive status
   const checkDriveStatus = async () => {
     try {
@@ -51,47 +96,7 @@ const WaitingRoom = () => {
           params: { token },
           headers: { Authorization: `Bearer ${token}` }
         });
-        setDriveDetails(driveResponse.data);
-
-        // Calculate window time remaining
-        // Priority: actual_window_end (set when manually ended) > window_end (scheduled)
-        // Backend sends UTC datetime strings - parse them as UTC
-        const windowEndTime = driveResponse.data.actual_window_end || driveResponse.data.window_end;
-
-        if (windowEndTime) {
-          // Parse UTC datetime string as UTC
-          let windowEnd;
-          if (typeof windowEndTime === 'string') {
-            const isoString = windowEndTime + (windowEndTime.includes('Z') ? '' : 'Z');
-            windowEnd = new Date(isoString);
-          } else {
-            windowEnd = new Date(windowEndTime);
-          }
-
-          // Store window end time in localStorage for disqualification logic
-          localStorage.setItem('exam_window_end', windowEnd.toISOString());
-
-          const now = new Date();
-          const diffMs = windowEnd - now;
-
-          console.log('Window end calculation:', {
-            actual_window_end: driveResponse.data.actual_window_end,
-            window_end: driveResponse.data.window_end,
-            using: windowEndTime,
-            windowEnd_ISO: windowEnd.toISOString(),
-            now_ISO: now.toISOString(),
-            diffMs,
-            diffMinutes: Math.floor(diffMs / 60000)
-          });
-
-          if (diffMs > 0) {
-            const hours = Math.floor(diffMs / 3600000);
-            const minutes = Math.floor((diffMs % 3600000) / 60000);
-            setWindowTimeRemaining(`${hours}h ${minutes}m`);
-          } else {
-            setWindowTimeRemaining('Closed');
-          }
-        }
+        applyDriveInfo(driveResponse.data);
       } catch (err) {
         console.error('Error fetching drive details:', err);
       }
@@ -147,12 +152,31 @@ const WaitingRoom = () => {
     // Initial check
     checkDriveStatus();
 
-    // Poll for drive status every 5 seconds
-    const interval = setInterval(() => {
-      checkDriveStatus();
-    }, 5000);
+    // Status changes are pushed by the server; fall back to polling every 5 seconds
+    // if the event stream is unavailable
+    let interval = null;
+    const token = localStorage.getItem('student_access_token');
+    const events = new EventSource(`${API_ENDPOINTS.driveEvents}?token=${encodeURIComponent(token)}`);
+
+    events.addEventListener('status', (event) => {
+      const driveInfo = JSON.parse(event.data);
+      setDriveStatus(driveInfo.status);
+      setCanStart(driveInfo.status === 'live' || driveInfo.status === 'ongoing');
+      applyDriveInfo(driveInfo);
+    });
+
+    events.onerror = () => {
+      if (events.readyState === EventSource.CLOSED && !interval) {
+        interval = setInterval(() => {
+          checkDriveStatus();
+        }, 5000);
+      }
+    };
 
-    return () => clearInterval(interval);
+    return () => {
+      events.close();
+      if (interval) clearInterval(interval);
+    };
   }, [student, navigate]);
 
   const handleStartExam = () => {
@@ -9,10 +9,12 @@ export const API_ENDPOINTS = {
   startExam: `${API_BASE_URL}/api/student/exam/start`,
   getQuestions: `${API_BASE_URL}/api/student/exam/questions`,
   recordViolation: `${API_BASE_URL}/api/student/exam/violation`,
+  recordViolationsBatch: `${API_BASE_URL}/api/student/exam/violations/batch`,
   disqualifyStudent: `${API_BASE_URL}/api/student/exam/disqualify`,
   submitExam: `${API_BASE_URL}/api/student/exam/submit`,
   getResult: `${API_BASE_URL}/api/student/exam/result`,
   driveInfo: `${API_BASE_URL}/api/student/drive-info`,
+  driveEvents: `${API_BASE_URL}/api/student/drive-events`,
 };
 
 export default API_BASE_URL;